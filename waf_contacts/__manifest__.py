@@ -11,7 +11,8 @@
         'views/region_views.xml',
         'data/res_country_state_regions.xml',
         'data/res_country_state_departments.xml',
-        'views/res_partner_views.xml'
+        'views/res_partner_views.xml',
+        'data/ir_cron.xml',
     ],
     'license': 'LGPL-3',
 }
@@ -1,4 +1,5 @@
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
+from .res_partner import zip_prefix_codes
 
 class ResCountryState(models.Model):
     _inherit = 'res.country.state'
@@ -10,6 +11,53 @@ class ResCountryState(models.Model):
     
     region_id = fields.Many2one('res.country.state', string='Région', 
                                 compute='_compute_region_id', store=True) 
+
+    # Champs dont dépend la table des codes postaux
+    ZIP_LOOKUP_FIELDS = {'code', 'parent_id', 'country_id'}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        states = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return states
+
+    def write(self, vals):
+        res = super().write(vals)
+        if self.ZIP_LOOKUP_FIELDS & set(vals):
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    @tools.ormcache()
+    def _get_fr_zip_lookup(self):
+        """Table préfixe de code postal (3 chiffres) -> (région, département)
+
+        Construite une fois par registre et invalidée à chaque modification
+        des états ; le département vaut False s'il est introuvable.
+        """
+        states = self.sudo().with_context(active_test=False).search_read(
+            [('country_id.code', '=', 'FR')], ['code', 'parent_id']
+        )
+        regions = {state['code']: state['id'] for state in states if not state['parent_id']}
+        departments = {
+            (state['parent_id'][0], state['code']): state['id']
+            for state in states if state['parent_id']
+        }
+
+        lookup = {}
+        for number in range(1000):
+            prefix = f"{number:03d}"
+            codes = zip_prefix_codes(prefix)
+            if not codes or codes[0] not in regions:
+                continue
+            region_id = regions[codes[0]]
+            lookup[prefix] = (region_id, departments.get((region_id, codes[1]), False))
+        return lookup
     
     @api.depends('parent_id', 'is_region', 'is_department')
     def _compute_region_id(self):
@@ -1,4 +1,9 @@
-from odoo import models, fields, api
+from collections import defaultdict
+from odoo import models, fields, api, _
+import logging
+import threading
+
+_logger = logging.getLogger(__name__)
 
 # Mapping des codes postaux vers (région, département)
 ZIP_MAPPING = {
@@ -8,10 +13,6 @@ ZIP_MAPPING = {
     '973': ('ROM', '973'),  # Guyane
     '974': ('ROM', '974'),  # La Réunion
     '976': ('ROM', '976'),  # Mayotte
-    # Corse (sans département prédéfini)
-    '20': ('COR', False),   # Corse (2A ou 2B à sélectionner)
-    
-    '97': ('ROM', ('Guadeloupe', 'Martinique', 'Guyane', 'La Réunion', 'Mayotte')),
     # Auvergne-Rhône-Alpes (ARA)
     '01': ('ARA', '01'), '03': ('ARA', '03'), '07': ('ARA', '07'),
     '15': ('ARA', '15'), '26': ('ARA', '26'), '38': ('ARA', '38'),
@@ -61,6 +62,23 @@ ZIP_MAPPING = {
     '13': ('PAC', '13'), '83': ('PAC', '83'), '84': ('PAC', '84'),
 }
 
+# Corse : 200xx et 201xx pour la Corse-du-Sud, 202xx à 206xx pour la Haute-Corse
+CORSICA_ZIP_PREFIXES = {'200': '2A', '201': '2A'}
+
+
+def zip_prefix_codes(prefix):
+    """Codes (région, département) d'un préfixe de code postal à 3 chiffres
+
+    Returns:
+        tuple: ``(region_code, department_code)`` ou None si le préfixe ne
+        correspond à aucun département français
+    """
+    if prefix.startswith('97'):
+        return ZIP_MAPPING.get(prefix)
+    if prefix.startswith('20'):
+        return 'COR', CORSICA_ZIP_PREFIXES.get(prefix, '2B')
+    return ZIP_MAPPING.get(prefix[:2])
+
 class ResPartner(models.Model):
     _inherit = 'res.partner'
 
@@ -90,35 +108,21 @@ class ResPartner(models.Model):
         self.region_id = False
         self.state_id = False
 
-        if not self.zip or not self.country_id or self.country_id != self.env.ref('base.fr'):
+        if not self.zip or self.country_id.code != 'FR':
             return
 
         # Validation du format du code postal français (5 chiffres)
-        if self.country_id == self.env.ref('base.fr'):
-            if not self.zip or len(self.zip) != 5 or not self.zip.isdigit():
-                return {
-                    'warning': {
-                        'title': 'Code postal incorrect',
-                        'message': 'Le code postal français doit contenir exactement 5 chiffres.'
-                    }
+        if len(self.zip) != 5 or not self.zip.isdigit():
+            return {
+                'warning': {
+                    'title': 'Code postal incorrect',
+                    'message': 'Le code postal français doit contenir exactement 5 chiffres.'
                 }
+            }
 
-        # Essayer d'abord avec le préfixe précis
-        if self.zip.startswith('97') and len(self.zip) >= 3:
-            zip_prefix = self.zip[:3]  # 971, 972, etc.
-        elif self.zip.startswith('20'):
-            zip_prefix = '20'  # Corse
-            department_code = False  # On laisse l'utilisateur choisir entre 2A et 2B
-        else:
-            zip_prefix = self.zip[:2]  # Autres cas
-
-        # Chercher d'abord dans le mapping précis
-        if zip_prefix in ZIP_MAPPING:
-            region_code, department_code = ZIP_MAPPING[zip_prefix]
-        # Sinon, essayer le mapping générique
-        elif zip_prefix[:2] in ZIP_MAPPING:
-            region_code, department_code = ZIP_MAPPING[zip_prefix[:2]]
-        else:
+        # Table précalculée : aucune requête à la saisie
+        region_id, department_id = self.env['res.country.state']._get_fr_zip_lookup().get(self.zip[:3], (False, False))
+        if not region_id:
             return {
                 'warning': {
                     'title': 'Code postal non reconnu',
@@ -126,36 +130,108 @@ class ResPartner(models.Model):
                 }
             }
 
-        region = self.env['res.country.state'].search([
-            ('country_id.code', '=', 'FR'),
-            ('code', '=', region_code)
-        ], limit=1)
-        
-        if region:
-            self.region_id = region.id
-            
-            # On peut aussi définir directement le département
-            if department_code:
-                department = self.env['res.country.state'].search([
-                    ('country_id.code', '=', 'FR'),
-                    ('code', '=', department_code),
-                    ('parent_id', '=', region.id)
-                ], limit=1)
-                if department:
-                    self.state_id = department.id
-                    return
-                
-        # Warning pour département manquant seulement si on a un code postal valide
-        if self.zip and len(self.zip) == 5 and self.zip.isdigit() and not self.state_id:
-            return {
-                'warning': {
-                    'title': 'Département requis',
-                    'message': 'Veuillez sélectionner un département.'
-                }
+        self.region_id = region_id
+        if department_id:
+            self.state_id = department_id
+            return
+
+        # Warning pour département manquant
+        return {
+            'warning': {
+                'title': 'Département requis',
+                'message': 'Veuillez sélectionner un département.'
             }
+        }
 
     @api.onchange('country_id')
     def _onchange_country_id(self):
-        if self.country_id != self.env.ref('base.fr'):
+        if self.country_id.code != 'FR':
             self.region_id = False
             self.state_id = False
+
+    def _get_fr_region_updates(self, where, params):
+        """Contacts français dont la région ou le département ne correspond pas au code postal
+
+        Returns:
+            list: Tuples ``(partner_id, region_id, state_id)`` à appliquer
+        """
+        lookup = self.env['res.country.state']._get_fr_zip_lookup()
+        if not lookup:
+            return []
+        prefixes = list(lookup)
+        params = dict(
+            params,
+            prefixes=prefixes,
+            regions=[lookup[prefix][0] for prefix in prefixes],
+            states=[lookup[prefix][1] or None for prefix in prefixes],
+        )
+        self.env.cr.execute("""
+            SELECT p.id, m.region_id, COALESCE(m.state_id, p.state_id)
+            FROM res_partner p
+            JOIN res_country c ON c.id = p.country_id AND c.code = 'FR'
+            JOIN unnest(%(prefixes)s::varchar[], %(regions)s::int[], %(states)s::int[])
+                AS m(prefix, region_id, state_id) ON m.prefix = left(p.zip, 3)
+            WHERE p.zip ~ '^[0-9]{5}$'
+              AND """ + where + """
+              AND (p.region_id IS DISTINCT FROM m.region_id
+                   OR p.state_id IS DISTINCT FROM COALESCE(m.state_id, p.state_id))
+            ORDER BY p.id
+        """, params)
+        return self.env.cr.fetchall()
+
+    def _apply_fr_region_updates(self, rows):
+        """Ecritures groupées par couple (région, département)"""
+        groups = defaultdict(list)
+        for partner_id, region_id, state_id in rows:
+            groups[(region_id, state_id)].append(partner_id)
+        for (region_id, state_id), ids in groups.items():
+            self.browse(ids).write({'region_id': region_id, 'state_id': state_id})
+        return len(rows)
+
+    def action_backfill_fr_regions(self):
+        """Action serveur : recalcule région et département des contacts sélectionnés"""
+        rows = self._get_fr_region_updates('p.id = ANY(%(ids)s)', {'ids': self.ids})
+        count = self._apply_fr_region_updates(rows)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Régions et départements'),
+                'message': _('%s contact(s) mis à jour', count),
+                'type': 'success',
+                'sticky': False,
+            }
+        }
+
+    @api.model
+    def _cron_backfill_fr_regions(self, chunk_size=None, restart=False):
+        """Cron : renseigne région et département de tous les contacts français
+
+        Les contacts sont parcourus par tranches d'identifiants ; la dernière
+        tranche traitée est mémorisée dans ``waf_contacts.region_backfill_last_id``
+        pour reprendre après une interruption. ``restart`` repart du début.
+
+        Returns:
+            int: Nombre de contacts mis à jour
+        """
+        params = self.env['ir.config_parameter'].sudo()
+        chunk_size = chunk_size or int(params.get_param('waf_contacts.region_backfill_chunk_size', 5000))
+        last_id = 0 if restart else int(params.get_param('waf_contacts.region_backfill_last_id', 0))
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+
+        self.env.cr.execute("SELECT COALESCE(max(id), 0) FROM res_partner")
+        max_id = self.env.cr.fetchone()[0]
+
+        updated = 0
+        while last_id < max_id:
+            stop = last_id + chunk_size
+            rows = self._get_fr_region_updates(
+                'p.id > %(start)s AND p.id <= %(stop)s', {'start': last_id, 'stop': stop}
+            )
+            updated += self._apply_fr_region_updates(rows)
+            last_id = min(stop, max_id)
+            params.set_param('waf_contacts.region_backfill_last_id', last_id)
+            _logger.info(f"Régions des contacts : {last_id}/{max_id} identifiants parcourus, {updated} contacts mis à jour")
+            if auto_commit:
+                self.env.cr.commit()
+        return updated
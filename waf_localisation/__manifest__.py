@@ -23,6 +23,8 @@
         'security/security.xml',
         'security/ir.model.access.csv',
         'views/res_partner_views.xml',
+        'views/ban_geocode_cache_views.xml',
+        'data/ir_cron.xml',
     ],
     'installable': True,
     'application': False,
@@ -1,3 +1,5 @@
 from . import api
 from . import mixins
+from . import ban_geocode_cache
+from . import res_company
 from . import res_partner
\ No newline at end of file
@@ -1,2 +1,4 @@
+from . import cache
 from . import base_api
-from . import ban_api
\ No newline at end of file
+from . import ban_api
+from . import ban_offline
\ No newline at end of file
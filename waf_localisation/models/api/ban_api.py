@@ -1,9 +1,25 @@
-from typing import Optional, Dict, Any, List, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Tuple, Union
 from .base_api import BaseAPIService, APIResponse
+import csv
+import io
 import logging
+import re
+import unicodedata
 
 _logger = logging.getLogger(__name__)
 
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_query(value: Any) -> str:
+    """Normalise une valeur de requête : minuscules, sans accents ni espaces superflus"""
+    text = unicodedata.normalize('NFKD', str(value))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return _WHITESPACE_RE.sub(' ', text).strip().lower()
+
 
 class BanAPIService(BaseAPIService):
     """Service API pour la Base Adresse Nationale (BAN)"""
@@ -11,6 +27,19 @@ class BanAPIService(BaseAPIService):
     SEARCH_TYPES = {'municipality', 'housenumber', 'street'}
     MAX_LIMIT = 100
 
+    # Les adresses évoluent peu : les réponses valides sont gardées une semaine
+    cache_ttl = 7 * 24 * 3600
+
+    # La BAN limite chaque IP à 50 requêtes par seconde
+    rate_limit = 40.0
+
+    # Géocodage en masse (endpoint CSV)
+    BATCH_ENDPOINT = '/search/csv/'
+    BATCH_CHUNK_SIZE = 1000
+    BATCH_MAX_WORKERS = 2
+    BATCH_TIMEOUT = 300
+    BATCH_COLUMNS = ('id', 'adresse', 'postcode', 'city')
+
     ERROR_MESSAGES = {
         'empty_query': 'La requête ne peut être vide',
         'invalid_coordinates': 'Les coordonnées géographiques ne sont pas valides',
@@ -60,23 +89,20 @@ class BanAPIService(BaseAPIService):
             return True
         return bool(postcode.strip().isdigit() and len(postcode.strip()) == 5)
 
-    def search_address(
+    def _prepare_search_address(
         self,
         query: str,
         postcode: Optional[str] = None,
         city: Optional[str] = None,
         limit: int = 5,
         search_type: str = 'municipality',
-    ) -> APIResponse:
-        """Recherche d'une adresse"""
-        _logger.info(f"""
-        ====== BAN API REQUEST ======
-        Query: {query}
-        Postcode: {postcode}
-        City: {city}
-        Type: {search_type}
-        ============================""")
+    ) -> Union[APIResponse, Tuple[str, str, Dict[str, Any]]]:
+        """Valide une recherche d'adresse
 
+        Returns:
+            APIResponse en cas d'erreur de validation, sinon le tuple
+            ``(cache_key, endpoint, params)`` de la requête à exécuter
+        """
         if not query or not query.strip():
             return APIResponse(success=False, error=self.ERROR_MESSAGES['empty_query'])
 
@@ -102,11 +128,34 @@ class BanAPIService(BaseAPIService):
         if city:
             params['city'] = city.strip()
 
+        return self._generate_cache_key('address', **params), '/search', params
+
+    def search_address(
+        self,
+        query: str,
+        postcode: Optional[str] = None,
+        city: Optional[str] = None,
+        limit: int = 5,
+        search_type: str = 'municipality',
+    ) -> APIResponse:
+        """Recherche d'une adresse"""
+        _logger.info(f"""
+        ====== BAN API REQUEST ======
+        Query: {query}
+        Postcode: {postcode}
+        City: {city}
+        Type: {search_type}
+        ============================""")
+
+        prepared = self._prepare_search_address(query, postcode, city, limit, search_type)
+        if isinstance(prepared, APIResponse):
+            return prepared
+        cache_key, endpoint, params = prepared
+
         _logger.info(f"Final params: {params}")
         
         # Utiliser le cache pour cette requête
-        cache_key = self._generate_cache_key('address', **params)
-        response = self.get_cached_request(cache_key, '/search', **params)
+        response = self.get_cached_request(cache_key, endpoint, **params)
         
         if response.success and response.data:
             _logger.info(f"""
@@ -124,14 +173,33 @@ class BanAPIService(BaseAPIService):
 
         return response
 
-    def reverse_geocode(
+    def search_address_many(self, queries: Iterable[Union[str, Dict[str, Any]]]) -> List[APIResponse]:
+        """Recherche de plusieurs adresses en parallèle
+
+        Args:
+            queries: Chaînes de recherche, ou dictionnaires des arguments
+                de ``search_address`` (``query``, ``postcode``, ``city``...)
+
+        Returns:
+            list: Réponses dans l'ordre des recherches fournies
+        """
+        prepared = [
+            self._prepare_search_address(**query) if isinstance(query, dict) else self._prepare_search_address(query)
+            for query in queries
+        ]
+        responses = self.get_cached_request_many(prepared)
+        _logger.info(f"BAN API : {len(responses)} recherches d'adresses, "
+                     f"{sum(1 for r in responses if not r.success)} en erreur")
+        return responses
+
+    def _prepare_reverse_geocode(
         self,
         lat: float,
         lon: float,
         limit: int = 5,
         type: Optional[str] = None
-    ) -> APIResponse:
-        """Rétro-codage d'une coordonnée géographique"""
+    ) -> Union[APIResponse, Tuple[str, Dict[str, Any]]]:
+        """Valide un rétro-codage ; retourne une erreur ou ``(endpoint, params)``"""
         if not self._validate_coordinates(lat, lon):
             return APIResponse(
                 success=False,
@@ -142,10 +210,44 @@ class BanAPIService(BaseAPIService):
             'lat': lat,
             'lon': lon,
             'limit': self._validate_limit(limit),
-            'type': self._validate_search_type(type) if type else None
         }
+        if type:
+            params['type'] = self._validate_search_type(type)
+
+        return 'reverse', params
+
+    def reverse_geocode(
+        self,
+        lat: float,
+        lon: float,
+        limit: int = 5,
+        type: Optional[str] = None
+    ) -> APIResponse:
+        """Rétro-codage d'une coordonnée géographique"""
+        prepared = self._prepare_reverse_geocode(lat, lon, limit, type)
+        if isinstance(prepared, APIResponse):
+            return prepared
+        endpoint, params = prepared
+        return self._make_request(endpoint, params=params)
 
-        return self._make_request('reverse', params=params)
+    def reverse_geocode_many(self, coordinates: Iterable[Union[Tuple[float, float], Dict[str, Any]]]) -> List[APIResponse]:
+        """Rétro-codage de plusieurs coordonnées en parallèle
+
+        Args:
+            coordinates: Couples ``(lat, lon)`` ou dictionnaires des arguments
+                de ``reverse_geocode``
+
+        Returns:
+            list: Réponses dans l'ordre des coordonnées fournies
+        """
+        prepared = [
+            self._prepare_reverse_geocode(**coords) if isinstance(coords, dict) else self._prepare_reverse_geocode(*coords)
+            for coords in coordinates
+        ]
+        calls = [(index, spec) for index, spec in enumerate(prepared) if not isinstance(spec, APIResponse)]
+        for (index, _spec), response in zip(calls, self._make_request_many([spec for _index, spec in calls])):
+            prepared[index] = response
+        return prepared
 
     def search_postcode(self, postcode: str, limit: int=5) -> APIResponse:
         """Recherche d'un code postal"""
@@ -171,13 +273,134 @@ class BanAPIService(BaseAPIService):
         return self.get_cached_request(cache_key, '/search', **params)
 
     def _generate_cache_key(self, prefix: str, **kwargs) -> str:
-        """Génération d'une clé de cache"""
+        """Génération d'une clé de cache normalisée
+
+        Deux requêtes ne différant que par la casse, les accents ou les
+        espaces partagent la même clé.
+        """
         key_parts = [self.name, prefix]
         for k, v in sorted(kwargs.items()):
             if v:
-                key_parts.append(f"{k}_{v}")
+                key_parts.append(f"{k}_{normalize_query(v)}")
         return '_'.join(key_parts)
 
     def _get_cached_response(self, cache_key: str, endpoint: str, **kwargs) -> APIResponse:
         """Récupération d'une réponse en cache"""
         return self.get_cached_request(cache_key, endpoint, **kwargs)
+
+    def geocode_batch(
+        self,
+        records: Iterable[Any],
+        chunk_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[Dict[Any, APIResponse]]:
+        """Géocodage en masse via l'endpoint CSV de la BAN
+
+        Les adresses sont envoyées par paquets de ``chunk_size`` lignes,
+        ``max_workers`` paquets pouvant être en vol simultanément. Chaque
+        paquet produit un dictionnaire ``{id: APIResponse}`` dont les données
+        ont la même forme que celles de ``/search`` (FeatureCollection).
+
+        Args:
+            records: Dictionnaires ou enregistrements exposant ``id``,
+                ``street``, ``zip`` et ``city``
+            chunk_size: Nombre d'adresses par requête
+            max_workers: Nombre de requêtes simultanées
+
+        Yields:
+            dict: Résultats d'un paquet, dans l'ordre d'envoi des paquets
+        """
+        chunk_size = max(1, int(chunk_size or self.BATCH_CHUNK_SIZE))
+        max_workers = max(1, int(max_workers or self.BATCH_MAX_WORKERS))
+
+        # Les lignes CSV sont construites dans le thread appelant : seuls des
+        # tuples de chaînes sont transmis aux threads du pool.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque()
+            for rows in self._iter_batch_chunks(records, chunk_size):
+                pending.append(executor.submit(self._geocode_chunk, rows))
+                if len(pending) >= max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _iter_batch_chunks(self, records: Iterable[Any], chunk_size: int) -> Iterator[List[Tuple[Any, str, str, str]]]:
+        """Découpe les enregistrements en paquets de lignes CSV"""
+        rows = (self._batch_row(record) for record in records)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _batch_row(self, record: Any) -> Tuple[Any, str, str, str]:
+        """Construit la ligne CSV (id, adresse, code postal, ville) d'un enregistrement"""
+        if isinstance(record, dict):
+            get = record.get
+        else:
+            get = lambda field: getattr(record, field, None)
+        return (
+            get('id'),
+            (get('street') or '').strip(),
+            (get('zip') or '').strip(),
+            (get('city') or '').strip(),
+        )
+
+    def _geocode_chunk(self, rows: List[Tuple[Any, str, str, str]]) -> Dict[Any, APIResponse]:
+        """Envoie un paquet d'adresses à l'endpoint CSV et analyse la réponse"""
+        payload = io.StringIO()
+        writer = csv.writer(payload)
+        writer.writerow(self.BATCH_COLUMNS)
+        writer.writerows(rows)
+
+        files = {'data': ('addresses.csv', payload.getvalue().encode('utf-8'), 'text/csv')}
+        form = [('columns', 'adresse'), ('columns', 'city'), ('postcode', 'postcode')]
+        # L'en-tête JSON de la session doit être retiré pour l'envoi multipart
+        headers = {'Content-Type': None, 'Accept': 'text/csv'}
+
+        response = self._send(self.BATCH_ENDPOINT, method='POST', files=files, data=form, headers=headers, timeout=self.BATCH_TIMEOUT)
+        if isinstance(response, APIResponse):
+            return {row[0]: response for row in rows}
+        return self._parse_batch_csv(response.content.decode('utf-8-sig'), rows)
+
+    def _parse_batch_csv(self, content: str, rows: List[Tuple[Any, str, str, str]]) -> Dict[Any, APIResponse]:
+        """Convertit le CSV renvoyé par la BAN en réponses par enregistrement"""
+        # Les identifiants reviennent sous forme de chaînes
+        ids = {str(row[0]): row[0] for row in rows}
+        empty = {'type': 'FeatureCollection', 'features': []}
+        results = {}
+
+        for line in csv.DictReader(io.StringIO(content)):
+            record_id = ids.get(line.get('id'))
+            if record_id is None:
+                continue
+            if line.get('result_status', 'ok') != 'ok' or not line.get('result_score'):
+                results[record_id] = APIResponse(success=True, data=empty, raw_response=line)
+                continue
+            results[record_id] = APIResponse(
+                success=True,
+                data={'type': 'FeatureCollection', 'features': [self._batch_line_to_feature(line)]},
+                raw_response=line,
+            )
+
+        for record_id in ids.values():
+            results.setdefault(record_id, APIResponse(success=True, data=empty))
+        return results
+
+    def _batch_line_to_feature(self, line: Dict[str, str]) -> Dict[str, Any]:
+        """Construit une feature GeoJSON à partir d'une ligne de résultat CSV"""
+        properties = {
+            key[len('result_'):]: value
+            for key, value in line.items()
+            if key and key.startswith('result_') and value
+        }
+        properties['score'] = float(properties['score'])
+        feature = {'type': 'Feature', 'properties': properties}
+        try:
+            feature['geometry'] = {
+                'type': 'Point',
+                'coordinates': [float(line['longitude']), float(line['latitude'])],
+            }
+        except (KeyError, TypeError, ValueError):
+            feature['geometry'] = None
+        return feature
@@ -0,0 +1,225 @@
+from collections import OrderedDict
+from difflib import SequenceMatcher, get_close_matches
+from threading import Lock, local
+from typing import Iterable, List, Optional, Tuple
+from .ban_api import normalize_query
+import csv
+import gzip
+import logging
+import os
+import re
+import shutil
+import sqlite3
+
+_logger = logging.getLogger(__name__)
+
+# Numéro et indice de répétition : "12 bis", "12bis" ou "12a" (lettre accolée)
+_NUMBER_RE = re.compile(r'^(\d+)(?:\s*(bis|ter|quater|quinquies)\b|([a-z])\b)?[\s,]*(.*)$')
+_PUNCTUATION_RE = re.compile(r"[^a-z0-9 ]+")
+
+# Abréviations usuelles des types de voie
+STREET_ABBREVIATIONS = {
+    'all': 'allee',
+    'av': 'avenue',
+    'bd': 'boulevard',
+    'bld': 'boulevard',
+    'ch': 'chemin',
+    'che': 'chemin',
+    'crs': 'cours',
+    'imp': 'impasse',
+    'pl': 'place',
+    'r': 'rue',
+    'rte': 'route',
+    'sq': 'square',
+}
+
+
+def normalize_street(value: Optional[str]) -> str:
+    """Normalise un nom de voie : sans accents ni ponctuation, abréviations développées"""
+    words = _PUNCTUATION_RE.sub(' ', normalize_query(value or '')).split()
+    return ' '.join(STREET_ABBREVIATIONS.get(word, word) for word in words)
+
+
+def split_street(street: Optional[str]) -> Tuple[Optional[int], str, str]:
+    """Sépare ``"12 bis rue de la Paix"`` en ``(12, 'bis', 'rue de la paix')``"""
+    text = normalize_query(street or '')
+    match = _NUMBER_RE.match(text)
+    if not match:
+        return None, '', normalize_street(text)
+    return int(match.group(1)), match.group(2) or match.group(3) or '', normalize_street(match.group(4))
+
+
+class BanOfflineIndex:
+    """Index local des adresses de la BAN, stocké dans un fichier SQLite
+
+    L'index est alimenté à partir des exports CSV départementaux de la BAN
+    (``adresses-XX.csv.gz``) et répond sans accès réseau. Les noms de voie
+    de chaque code postal sont gardés en mémoire pour la recherche floue.
+    """
+
+    STREETS_CACHE_SIZE = 2048
+    FUZZY_CUTOFF = 0.75
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = local()
+        self._streets = OrderedDict()
+        self._streets_lock = Lock()
+
+    @classmethod
+    def import_csv(cls, csv_paths: Iterable[str], index_path: str, batch_size: int = 10000) -> int:
+        """Importe des exports CSV de la BAN dans l'index
+
+        Les fichiers peuvent être compressés (``.gz``). Plusieurs imports
+        successifs sur le même index s'additionnent ; une adresse déjà
+        présente (même identifiant BAN) est remplacée. L'index est construit
+        dans un fichier temporaire qui remplace l'index en fin d'import.
+
+        Returns:
+            int: Nombre d'adresses importées
+        """
+        directory = os.path.dirname(index_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{index_path}.tmp'
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        if os.path.exists(index_path):
+            shutil.copyfile(index_path, tmp_path)
+
+        conn = sqlite3.connect(tmp_path)
+        count = 0
+        try:
+            conn.execute('PRAGMA journal_mode = OFF')
+            conn.execute('PRAGMA synchronous = OFF')
+            columns = [row[1] for row in conn.execute('PRAGMA table_info(addresses)')]
+            if columns and 'id' not in columns:
+                # Index antérieur sans identifiant : reconstruit à partir des fichiers fournis
+                _logger.warning(f"Index BAN hors ligne {index_path} sans identifiant d'adresse : reconstruction complète")
+                conn.execute('DROP TABLE addresses')
+                conn.execute('DROP TABLE IF EXISTS streets')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS addresses ('
+                'id TEXT PRIMARY KEY, postcode TEXT NOT NULL, street TEXT NOT NULL, number INTEGER, rep TEXT, '
+                'city TEXT, lon REAL, lat REAL) WITHOUT ROWID'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS streets ('
+                'postcode TEXT NOT NULL, street TEXT NOT NULL, PRIMARY KEY (postcode, street)) WITHOUT ROWID'
+            )
+
+            for csv_path in csv_paths:
+                opener = gzip.open if csv_path.endswith('.gz') else open
+                with opener(csv_path, 'rt', encoding='utf-8', newline='') as handle:
+                    rows = []
+                    for line in csv.DictReader(handle, delimiter=';'):
+                        postcode = line.get('code_postal') or ''
+                        street = normalize_street(line.get('nom_voie'))
+                        number = int(line['numero']) if (line.get('numero') or '').isdigit() else None
+                        rep = normalize_query(line.get('rep') or '')
+                        rows.append((
+                            line.get('id') or f'{postcode}|{street}|{number or ""}|{rep}',
+                            postcode,
+                            street,
+                            number,
+                            rep,
+                            normalize_query(line.get('nom_commune') or ''),
+                            float(line['lon']) if line.get('lon') else None,
+                            float(line['lat']) if line.get('lat') else None,
+                        ))
+                        if len(rows) >= batch_size:
+                            count += cls._insert_rows(conn, rows)
+                            rows = []
+                    count += cls._insert_rows(conn, rows)
+                _logger.info(f"Index BAN hors ligne : {csv_path} importé ({count} adresses au total)")
+
+            conn.execute('CREATE INDEX IF NOT EXISTS addresses_lookup_idx ON addresses (postcode, street, number)')
+            conn.commit()
+        except Exception:
+            conn.close()
+            os.remove(tmp_path)
+            raise
+        conn.close()
+        os.replace(tmp_path, index_path)
+        return count
+
+    @staticmethod
+    def _insert_rows(conn: sqlite3.Connection, rows: List[tuple]) -> int:
+        if not rows:
+            return 0
+        conn.executemany('INSERT OR REPLACE INTO addresses VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        conn.executemany('INSERT OR IGNORE INTO streets VALUES (?, ?)', {(row[1], row[2]) for row in rows})
+        return len(rows)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connexion en lecture seule propre au thread courant"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+            self._local.conn = conn
+        return conn
+
+    def _get_streets(self, postcode: str) -> List[str]:
+        """Noms de voie normalisés d'un code postal (cache LRU en mémoire)"""
+        with self._streets_lock:
+            if postcode in self._streets:
+                self._streets.move_to_end(postcode)
+                return self._streets[postcode]
+
+        streets = [row[0] for row in self._connection().execute(
+            'SELECT street FROM streets WHERE postcode = ?', (postcode,)
+        )]
+        with self._streets_lock:
+            self._streets[postcode] = streets
+            while len(self._streets) > self.STREETS_CACHE_SIZE:
+                self._streets.popitem(last=False)
+        return streets
+
+    def _has_number(self, postcode: str, street: str, number: int) -> bool:
+        return self._connection().execute(
+            'SELECT 1 FROM addresses WHERE postcode = ? AND street = ? AND number = ? LIMIT 1',
+            (postcode, street, number)
+        ).fetchone() is not None
+
+    def lookup(self, street: Optional[str], postcode: Optional[str], city: Optional[str] = None) -> float:
+        """Score d'existence d'une adresse dans l'index (0.0 à 1.0)
+
+        - 1.0 : voie et numéro trouvés
+        - 0.9 : voie trouvée, numéro absent ou non renseigné
+        - voie approchante : similarité du nom, pondérée de la même façon
+        - 0.0 : code postal inconnu ou aucune voie approchante
+        """
+        postcode = (postcode or '').strip()
+        number, _rep, street_name = split_street(street)
+        streets = self._get_streets(postcode) if postcode else []
+        if not streets or not street_name:
+            return 0.0
+
+        similarity = 1.0
+        if street_name not in streets:
+            matches = get_close_matches(street_name, streets, n=1, cutoff=self.FUZZY_CUTOFF)
+            if not matches:
+                return 0.0
+            similarity = SequenceMatcher(None, street_name, matches[0]).ratio()
+            street_name = matches[0]
+
+        if number is not None and self._has_number(postcode, street_name, number):
+            return similarity
+        return similarity * 0.9
+
+
+_indexes = {}
+_indexes_lock = Lock()
+
+
+def get_offline_index(path: Optional[str]) -> Optional[BanOfflineIndex]:
+    """Index hors ligne partagé du processus, rechargé si le fichier a changé"""
+    if not path or not os.path.exists(path):
+        return None
+    mtime = os.path.getmtime(path)
+    with _indexes_lock:
+        index, loaded_mtime = _indexes.get(path, (None, None))
+        if index is None or loaded_mtime != mtime:
+            index = BanOfflineIndex(path)
+            _indexes[path] = (index, mtime)
+        return index
@@ -1,10 +1,16 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from threading import BoundedSemaphore, Lock
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+from .cache import CacheBackend, get_shared_cache
+from .throttling import APIMetrics, CircuitBreaker, TokenBucket, parse_retry_after
 import requests
+from requests.adapters import HTTPAdapter
 from time import sleep
 import logging
+import random
 
 _logger = logging.getLogger(__name__)
 
@@ -20,14 +26,47 @@ class APIResponse:
 class BaseAPIService(ABC):
     """Classe abstraite de base pour les services API"""
 
-    def __init__(self, timeout: int = 10, retry_attempts: int = 3, retry_delay: int = 1, backoff_factor: int = 2.0):
-        """Initialisation du service API"""
+    # Durées de vie en cache (secondes) des réponses valides et des échecs
+    cache_ttl = 24 * 3600
+    negative_cache_ttl = 300
+
+    # Exécution concurrente : taille du pool de threads et nombre maximal de
+    # requêtes simultanées vers un même hôte (tous services confondus)
+    max_workers = 8
+    per_host_limit = 4
+
+    _host_semaphores = {}
+    _host_semaphores_lock = Lock()
+
+    # Limitation de débit (requêtes/seconde, None pour désactiver) et
+    # politique de nouvelle tentative
+    rate_limit = 10.0
+    rate_burst = None
+    retry_statuses = frozenset({429, 500, 502, 503, 504})
+    max_retry_after = 60
+    circuit_failure_threshold = 5
+    circuit_reset_timeout = 60
+
+    # Limiteur, disjoncteur et métriques partagés par service et par hôte
+    _throttle_states = {}
+    _throttle_states_lock = Lock()
+
+    def __init__(self, timeout: int = 10, retry_attempts: int = 3, retry_delay: int = 1, backoff_factor: int = 2.0, base_url: Optional[str] = None, cache: Optional[CacheBackend] = None, max_workers: Optional[int] = None, per_host_limit: Optional[int] = None):
+        """Initialisation du service API
+
+        ``base_url`` permet de pointer le service vers une autre instance
+        (serveur local de test, miroir interne...). ``cache`` remplace le
+        cache mémoire partagé par tous les services du processus.
+        """
         self.session = requests.Session()
-        self.base_url = self.get_base_url()
+        self.base_url = base_url or self.get_base_url()
+        self.cache = cache if cache is not None else get_shared_cache()
         self.timeout = timeout
         self.retry_attempts = retry_attempts
         self.retry_delay = retry_delay
         self.backoff_factor = backoff_factor
+        self.max_workers = max_workers or self.max_workers
+        self.per_host_limit = per_host_limit or self.per_host_limit
         self._setup_session()
 
     def _setup_session(self) -> None:
@@ -37,6 +76,40 @@ class BaseAPIService(ABC):
             'Content-Type': 'application/json',
             'Accept': 'application/json',
         })
+        # Pool de connexions dimensionné pour l'exécution concurrente
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(self.max_workers, self.per_host_limit))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _host_semaphore(self, url: str) -> BoundedSemaphore:
+        """Sémaphore limitant les requêtes simultanées vers l'hôte de l'URL"""
+        key = (urlsplit(url).netloc, self.per_host_limit)
+        with self._host_semaphores_lock:
+            if key not in self._host_semaphores:
+                self._host_semaphores[key] = BoundedSemaphore(self.per_host_limit)
+            return self._host_semaphores[key]
+
+    def _throttle_state(self) -> Dict[str, Any]:
+        """Limiteur de débit, disjoncteur et métriques partagés du service"""
+        key = (self.name, urlsplit(self.base_url).netloc)
+        with self._throttle_states_lock:
+            if key not in self._throttle_states:
+                self._throttle_states[key] = {
+                    'bucket': TokenBucket(self.rate_limit, self.rate_burst) if self.rate_limit else None,
+                    'breaker': CircuitBreaker(self.circuit_failure_threshold, self.circuit_reset_timeout),
+                    'metrics': APIMetrics(),
+                }
+            return self._throttle_states[key]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Métriques par endpoint et état du disjoncteur du service"""
+        state = self._throttle_state()
+        return {'circuit': state['breaker'].state, 'endpoints': state['metrics'].snapshot()}
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Délai exponentiel avec gigue avant la tentative suivante"""
+        delay = self.retry_delay * (self.backoff_factor ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
 
     @property
     @abstractmethod
@@ -64,25 +137,80 @@ class BaseAPIService(ABC):
         if not self._validate_params(params):
             return APIResponse(success=False, error="Paramètres invalides")
 
-        for attempt in range(self.retry_attempts):
-            url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
-            try:
-                response = self.session.request(method=method, url=url, params=params, json=data, headers=headers, timeout=self.timeout)
+        response = self._send(endpoint, method=method, params=params, json=data, headers=headers)
+        if isinstance(response, APIResponse):
+            return response
+        try:
+            payload = response.json()
+        except ValueError as e:
+            # Réponse 2xx non JSON (page de maintenance, proxy...) ; inclut requests.JSONDecodeError
+            _logger.error(f"Réponse invalide de l'API {self.name} - {endpoint} : {str(e)}")
+            return APIResponse(success=False, error=f"Réponse invalide de l'API {self.name}", raw_response=response.text)
+        return APIResponse(success=True, data=payload, raw_response=payload)
 
-                if response.ok:
-                    return APIResponse(success=response.ok, data=response.json(), raw_response=response.json())
+    def _send(self, endpoint: str, method: str = 'GET', **kwargs) -> Union[requests.Response, APIResponse]:
+        """Envoie une requête HTTP avec limitation de débit et nouvelles tentatives
 
-                if response.status_code in {401, 403, 404}:
-                    return self._handle_error(response)
+        Les erreurs réseau et les statuts ``retry_statuses`` (429, 5xx) sont
+        retentés avec un délai exponentiel avec gigue, ou le délai indiqué par
+        ``Retry-After``. Le disjoncteur refuse les appels après des échecs
+        répétés.
+
+        Returns:
+            La réponse HTTP en cas de succès, sinon une APIResponse d'erreur
+        """
+        url = f"{self.base_url.rstrip('/')}/{endpoint.lstrip('/')}"
+        kwargs.setdefault('timeout', self.timeout)
+        state = self._throttle_state()
+        bucket, breaker, metrics = state['bucket'], state['breaker'], state['metrics']
 
+        for attempt in range(self.retry_attempts):
+            if not breaker.allow():
+                metrics.add(endpoint, 'circuit_rejections')
+                _logger.warning(f"API {self.name} - {method} {url} : circuit ouvert, appel refusé")
+                return APIResponse(success=False, error=f"Service {self.name} temporairement indisponible (circuit ouvert)")
+
+            if bucket:
+                metrics.add(endpoint, 'throttled_seconds', bucket.acquire())
+            metrics.add(endpoint, 'requests')
+
+            try:
+                with self._host_semaphore(url):
+                    response = self.session.request(method=method, url=url, **kwargs)
             except requests.exceptions.RequestException as e:
+                breaker.record_failure()
                 if attempt == self.retry_attempts - 1:
+                    metrics.add(endpoint, 'failures')
                     _logger.error(f"Echec de la requête API {self.name} - {method} {url} : {str(e)} apres {self.retry_attempts} tentatives")
                     return APIResponse(success=False, error=f"Erreur API : {str(e)}")
+                wait_time = self._backoff_delay(attempt)
+            else:
+                if response.ok:
+                    breaker.record_success()
+                    return response
 
-                waite_time = self.retry_delay * (self.backoff_factor ** attempt)
-                _logger.warning(f"Tentative {attempt + 1}/{self.retry_attempts} echouée - {waite_time} secondes de pause")
-                sleep(waite_time)
+                if response.status_code not in self.retry_statuses:
+                    # Erreur client : le service répond, inutile de réessayer
+                    breaker.record_success()
+                    metrics.add(endpoint, 'failures')
+                    return self._handle_error(response)
+
+                breaker.record_failure()
+                if attempt == self.retry_attempts - 1:
+                    metrics.add(endpoint, 'failures')
+                    _logger.error(f"Echec de la requête API {self.name} - {method} {url} : statut {response.status_code} apres {self.retry_attempts} tentatives")
+                    return self._handle_error(response)
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after is not None:
+                    wait_time = min(retry_after, self.max_retry_after)
+                else:
+                    wait_time = self._backoff_delay(attempt)
+
+            metrics.add(endpoint, 'retries')
+            _logger.warning(f"Tentative {attempt + 1}/{self.retry_attempts} echouée - {wait_time:.2f} secondes de pause")
+            sleep(wait_time)
+
+        return self._no_response()
 
     def _handle_error(self, response: requests.Response) -> APIResponse:
         """Gestion des erreurs de réponse"""
@@ -108,15 +236,100 @@ class BaseAPIService(ABC):
 
         return APIResponse(success=False, error=error_message, raw_response=response.text)
 
-    @lru_cache(maxsize=128)
+    def _full_cache_key(self, cache_key: str, endpoint: str) -> str:
+        """Clé de cache complète : les réponses de deux instances de l'API
+        (``base_url`` différentes) ne sont pas partagées"""
+        return f"{self.base_url}{endpoint}:{cache_key}"
+
     def _cached_request(self, cache_key: str, endpoint: str, **params) -> APIResponse:
-        """Requête API avec cache"""
-        return self._make_request(endpoint, params=params)
+        """Requête API avec cache
+
+        Les échecs sont conservés moins longtemps que les réponses valides.
+        """
+        key = self._full_cache_key(cache_key, endpoint)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return APIResponse(**cached)
+
+        response = self._make_request(endpoint, params=params) or self._no_response()
+        self._cache_response(key, response)
+        return response
+
+    def _cache_response(self, key: str, response: APIResponse) -> None:
+        """Met une réponse en cache ; les échecs y restent moins longtemps"""
+        ttl = self.cache_ttl if response.success else self.negative_cache_ttl
+        if ttl > 0:
+            self.cache.set(key, asdict(response), ttl)
+
+    def _no_response(self) -> APIResponse:
+        return APIResponse(success=False, error=f"Aucune réponse de l'API {self.name}")
 
     def get_cached_request(self, cache_key: str, endpoint: str, **params) -> APIResponse:
         """Récupération de la requête API avec cache"""
         return self._cached_request(cache_key, endpoint, **params)
 
+    def _make_request_many(self, calls: List[Tuple[str, Optional[Dict[str, Any]]]]) -> List[APIResponse]:
+        """Exécute des requêtes GET ``(endpoint, params)`` en parallèle
+
+        Le pool compte au plus ``max_workers`` threads et chaque hôte reçoit au
+        plus ``per_host_limit`` requêtes simultanées. Les attentes entre deux
+        tentatives n'immobilisent que le thread concerné.
+
+        Returns:
+            list: Réponses dans l'ordre des appels
+        """
+        if not calls:
+            return []
+        if len(calls) == 1:
+            return [self._make_request(calls[0][0], params=calls[0][1]) or self._no_response()]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(calls))) as executor:
+            return list(executor.map(
+                lambda call: self._make_request(call[0], params=call[1]) or self._no_response(),
+                calls
+            ))
+
+    def get_cached_request_many(self, requests_specs: List[Union[APIResponse, Tuple[str, str, Dict[str, Any]]]]) -> List[APIResponse]:
+        """Version groupée de ``get_cached_request``
+
+        Chaque élément est soit un tuple ``(cache_key, endpoint, params)``,
+        soit une ``APIResponse`` déjà connue (erreur de validation par exemple)
+        renvoyée telle quelle. Le cache est consulté et alimenté dans le thread
+        appelant ; seules les requêtes absentes du cache, dédoublonnées, sont
+        exécutées en parallèle.
+
+        Returns:
+            list: Réponses dans l'ordre des éléments fournis
+        """
+        results = [None] * len(requests_specs)
+        misses = {}
+        for index, spec in enumerate(requests_specs):
+            if isinstance(spec, APIResponse):
+                results[index] = spec
+                continue
+            cache_key, endpoint, params = spec
+            key = self._full_cache_key(cache_key, endpoint)
+            if key in misses:
+                misses[key][2].append(index)
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[index] = APIResponse(**cached)
+            else:
+                misses[key] = (endpoint, params, [index])
+
+        keys = list(misses)
+        responses = self._make_request_many([(misses[key][0], misses[key][1]) for key in keys])
+        for key, response in zip(keys, responses):
+            self._cache_response(key, response)
+            for index in misses[key][2]:
+                results[index] = response
+        return results
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Statistiques du cache utilisé par le service"""
+        return self.cache.stats()
+
     def __del__(self):
         """Ferme la session HTTP"""
         if hasattr(self, 'session'):
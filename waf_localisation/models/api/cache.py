@@ -0,0 +1,258 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import RLock
+from typing import Any, Dict, Optional
+import json
+import logging
+import os
+import sqlite3
+import time
+
+_logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Interface commune des backends de cache des services API
+
+    Les valeurs mises en cache doivent être sérialisables en JSON ; chaque
+    lecture retourne une copie indépendante de la valeur enregistrée.
+    """
+
+    def __init__(self):
+        self._lock = RLock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Retourne la valeur associée à la clé, ou None si absente ou expirée"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Enregistre une valeur pour ``ttl`` secondes"""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Supprime une entrée"""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Vide le cache"""
+        pass
+
+    def _count(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += value
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs de succès, d'échecs, d'évictions et d'expirations"""
+        with self._lock:
+            return dict(self._counters)
+
+
+class MemoryCache(CacheBackend):
+    """Cache LRU en mémoire, borné en octets, avec durée de vie par entrée
+
+    Une seule instance est partagée par tous les services d'un processus
+    (voir ``get_shared_cache``) ; les accès sont protégés par un verrou.
+    """
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # clé -> (expiration, taille en octets, valeur sérialisée en JSON)
+        self._size = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            expires_at, size, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self._counters['expirations'] += 1
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        # La valeur est conservée sérialisée : les appelants ne peuvent pas
+        # modifier l'entrée en cache, et sa taille est celle du JSON encodé en UTF-8
+        value = json.dumps(value, default=str)
+        size = len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, size, value)
+            self._size += size
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._counters['evictions'] += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._counters, 'entries': len(self._entries), 'bytes': self._size}
+
+
+class SQLiteCache(CacheBackend):
+    """Cache persistant dans un fichier SQLite
+
+    Le fichier est partagé par tous les workers de la machine et survit aux
+    redémarrages. Chaque opération ouvre sa propre connexion et la ferme
+    à la fin de la transaction.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS api_cache ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+
+    @contextmanager
+    def _connect(self):
+        """Connexion en transaction (validée en sortie), fermée après usage"""
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            with self._connect() as conn:
+                row = conn.execute('SELECT value, expires_at FROM api_cache WHERE key = ?', (key,)).fetchone()
+                if row and row[1] <= time.time():
+                    conn.execute('DELETE FROM api_cache WHERE key = ?', (key,))
+                    self._count('expirations')
+                    row = None
+        except sqlite3.Error as e:
+            _logger.warning(f"Lecture du cache persistant {self.path} impossible : {str(e)}")
+            row = None
+
+        if row is None:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO api_cache (key, value, expires_at) VALUES (?, ?, ?)',
+                    (key, json.dumps(value, default=str), time.time() + ttl)
+                )
+        except sqlite3.Error as e:
+            _logger.warning(f"Ecriture du cache persistant {self.path} impossible : {str(e)}")
+
+    def delete(self, key: str) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute('DELETE FROM api_cache WHERE key = ?', (key,))
+        except sqlite3.Error as e:
+            _logger.warning(f"Suppression dans le cache persistant {self.path} impossible : {str(e)}")
+
+    def clear(self) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute('DELETE FROM api_cache')
+        except sqlite3.Error as e:
+            _logger.warning(f"Vidage du cache persistant {self.path} impossible : {str(e)}")
+
+    def purge_expired(self) -> int:
+        """Supprime les entrées expirées et retourne leur nombre"""
+        try:
+            with self._connect() as conn:
+                count = conn.execute('DELETE FROM api_cache WHERE expires_at <= ?', (time.time(),)).rowcount
+        except sqlite3.Error as e:
+            _logger.warning(f"Purge du cache persistant {self.path} impossible : {str(e)}")
+            return 0
+        self._count('evictions', count)
+        return count
+
+
+class TieredCache(CacheBackend):
+    """Cache à deux niveaux : un niveau rapide devant un niveau partagé
+
+    Les succès du second niveau sont recopiés dans le premier pour
+    ``front_ttl`` secondes au plus.
+    """
+
+    def __init__(self, front: CacheBackend, back: CacheBackend, front_ttl: float = 300):
+        super().__init__()
+        self.front = front
+        self.back = back
+        self.front_ttl = front_ttl
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.front.get(key)
+        if value is None:
+            value = self.back.get(key)
+            if value is not None:
+                self.front.set(key, value, self.front_ttl)
+        self._count('hits' if value is not None else 'misses')
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self.front.set(key, value, min(ttl, self.front_ttl))
+        self.back.set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self.front.delete(key)
+        self.back.delete(key)
+
+    def clear(self) -> None:
+        self.front.clear()
+        self.back.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), 'front': self.front.stats(), 'back': self.back.stats()}
+
+
+_shared_memory_cache = MemoryCache()
+_shared_caches = {}
+_shared_lock = RLock()
+
+
+def get_shared_cache(persistent_path: Optional[str] = None) -> CacheBackend:
+    """Cache partagé par tous les services du processus
+
+    Sans chemin, retourne le cache mémoire du processus ; avec un chemin,
+    retourne ce même cache placé devant un cache SQLite persistant.
+    """
+    if not persistent_path:
+        return _shared_memory_cache
+    with _shared_lock:
+        if persistent_path not in _shared_caches:
+            _shared_caches[persistent_path] = TieredCache(_shared_memory_cache, SQLiteCache(persistent_path))
+        return _shared_caches[persistent_path]
@@ -0,0 +1,132 @@
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Dict, Optional
+import time
+
+
+class TokenBucket:
+    """Limiteur de débit à jetons, partagé entre threads
+
+    ``rate`` jetons sont ajoutés par seconde, dans la limite de ``capacity``
+    (taille de rafale autorisée).
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self) -> float:
+        """Consomme un jeton, en attendant si nécessaire
+
+        Returns:
+            float: Temps passé à attendre (secondes)
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class CircuitBreaker:
+    """Disjoncteur : coupe les appels après des échecs répétés
+
+    Après ``failure_threshold`` échecs consécutifs, le circuit s'ouvre et les
+    appels sont refusés pendant ``reset_timeout`` secondes. Un unique appel
+    d'essai est ensuite autorisé : son succès referme le circuit, son échec
+    le rouvre.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = Lock()
+
+    def allow(self) -> bool:
+        """Indique si un appel peut être tenté"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class APIMetrics:
+    """Compteurs par endpoint : requêtes, nouvelles tentatives, échecs,
+    refus du disjoncteur et temps passé à attendre le limiteur de débit"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._endpoints = defaultdict(lambda: {
+            'requests': 0,
+            'retries': 0,
+            'failures': 0,
+            'circuit_rejections': 0,
+            'throttled_seconds': 0.0,
+        })
+
+    def add(self, endpoint: str, counter: str, value: float = 1) -> None:
+        with self._lock:
+            self._endpoints[endpoint][counter] += value
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {endpoint: dict(counters) for endpoint, counters in self._endpoints.items()}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Délai (secondes) indiqué par un en-tête ``Retry-After``
+
+    L'en-tête peut contenir un nombre de secondes ou une date HTTP.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,112 @@
+from odoo import models, fields, api
+from .api.cache import CacheBackend
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class GeocodeCacheBackend(CacheBackend):
+    """Niveau de cache adossé à la table ``ban.geocode.cache``
+
+    Partagé par tous les workers de la base ; les lectures et écritures se
+    font en SQL dans la transaction courante.
+    """
+
+    def __init__(self, env):
+        super().__init__()
+        self.env = env
+
+    def get(self, key):
+        value = self.env['ban.geocode.cache']._lookup(key)
+        self._count('hits' if value is not None else 'misses')
+        return value
+
+    def set(self, key, value, ttl):
+        self.env['ban.geocode.cache']._store(key, value, ttl)
+
+    def delete(self, key):
+        self.env['ban.geocode.cache'].sudo().search([('key', '=', key)]).unlink()
+
+    def clear(self):
+        self.env.cr.execute('DELETE FROM ban_geocode_cache')
+
+
+class BanGeocodeCache(models.Model):
+    _name = 'ban.geocode.cache'
+    _description = 'Cache des requêtes de géocodage BAN'
+    _order = 'fetched_at desc'
+    _rec_name = 'key'
+
+    key = fields.Char(string='Clé', required=True, index=True, readonly=True, help="Clé normalisée de la requête")
+    payload = fields.Text(string='Réponse (JSON)', required=True, readonly=True)
+    success = fields.Boolean(string='Succès', readonly=True)
+    fetched_at = fields.Datetime(string='Récupéré le', required=True, readonly=True, default=fields.Datetime.now)
+    expires_at = fields.Datetime(string='Expire le', required=True, readonly=True, index=True)
+
+    _sql_constraints = [
+        ('key_unique', 'unique(key)', 'La clé de cache doit être unique !'),
+    ]
+
+    @api.model
+    def _lookup(self, key):
+        """Retourne la réponse en cache pour la clé, ou None si absente ou expirée
+
+        Lecture seule : les succès sont comptés en mémoire par le backend
+        (``stats``), sans écriture concurrente sur les lignes les plus lues.
+        """
+        self.env.cr.execute("""
+            SELECT payload FROM ban_geocode_cache
+            WHERE key = %s AND expires_at > (now() AT TIME ZONE 'UTC')
+        """, (key,))
+        row = self.env.cr.fetchone()
+        return json.loads(row[0]) if row else None
+
+    @api.model
+    def _store(self, key, value, ttl):
+        """Enregistre (ou remplace) une réponse pour ``ttl`` secondes"""
+        self.env.cr.execute("""
+            INSERT INTO ban_geocode_cache
+                (key, payload, success, fetched_at, expires_at,
+                 create_uid, create_date, write_uid, write_date)
+            VALUES (%s, %s, %s, now() AT TIME ZONE 'UTC',
+                    (now() AT TIME ZONE 'UTC') + %s * interval '1 second',
+                    %s, now() AT TIME ZONE 'UTC', %s, now() AT TIME ZONE 'UTC')
+            ON CONFLICT (key) DO UPDATE SET
+                payload = EXCLUDED.payload,
+                success = EXCLUDED.success,
+                fetched_at = EXCLUDED.fetched_at,
+                expires_at = EXCLUDED.expires_at,
+                write_uid = EXCLUDED.write_uid,
+                write_date = EXCLUDED.write_date
+        """, (key, json.dumps(value, default=str), bool(value.get('success')), ttl, self.env.uid, self.env.uid))
+
+    @api.model
+    def _get_cache_backend(self):
+        """Niveau de cache base de données, à placer derrière le cache mémoire"""
+        return GeocodeCacheBackend(self.env)
+
+    @api.model
+    def _gc_expired_entries(self):
+        """Cron : supprime les entrées expirées"""
+        self.env.cr.execute("DELETE FROM ban_geocode_cache WHERE expires_at <= (now() AT TIME ZONE 'UTC')")
+        count = self.env.cr.rowcount
+        _logger.info(f"Cache de géocodage BAN : {count} entrées expirées supprimées")
+        return count
+
+    @api.model
+    def prewarm_postcodes(self, postcodes):
+        """Préchauffe le cache avec les communes d'une liste de codes postaux
+
+        Returns:
+            int: Nombre de codes postaux dont la réponse est désormais en cache
+        """
+        service = self.env['res.partner']._get_ban_service()
+        count = 0
+        for postcode in sorted({(postcode or '').strip() for postcode in postcodes}):
+            if not service._validate_postcode(postcode) or not postcode:
+                continue
+            if service.search_postcode(postcode).success:
+                count += 1
+        _logger.info(f"Cache de géocodage BAN : {count} codes postaux préchauffés")
+        return count
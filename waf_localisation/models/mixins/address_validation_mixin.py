@@ -1,8 +1,16 @@
 from odoo import models, api
-import requests
+from odoo.exceptions import AccessError, UserError
+from odoo.tools.translate import _
+from ..api.ban_offline import BanOfflineIndex, get_offline_index
 from unidecode import unidecode
 import re
 
+# Motifs précompilés de validation du format
+ZIP_RE = re.compile(r'^\d{5}$')
+CITY_RE = re.compile(r'^[a-z\- ]+$')
+STREET_RE = re.compile(r'^[a-z0-9\- ]+$')
+DIGITS_RE = re.compile(r'\d+')
+
 class AddressValidationMixin(models.AbstractModel):
     _name = 'address.validation.mixin'
     _description = 'Mixin pour la validation des adresses'
@@ -19,60 +27,145 @@ class AddressValidationMixin(models.AbstractModel):
         Returns:
             dict: Résultat de la validation
         """
+        key = (street, zip, city)
+        return self._validate_french_addresses([key])[key]
+
+    def _validate_french_addresses(self, addresses):
+        """Valide un lot d'adresses françaises
+
+        Les adresses identiques ne sont validées qu'une fois et l'existence
+        dans la BAN est vérifiée en un seul appel pour tout le lot.
+
+        Args:
+            addresses (iterable): Tuples ``(street, zip, city)``
+
+        Returns:
+            dict: Résultat de la validation par tuple
+        """
         # Score initial basé sur le format
-        format_score = self._validate_address_format(street, zip, city)
-        
+        results = {key: self._validate_address_format(*key) for key in set(addresses)}
+
         # Si le format est incorrect, on ne vérifie pas la BAN
-        if format_score['score'] < 0.5:
-            return format_score
-            
+        to_check = [key for key, result in results.items() if result['score'] >= 0.5]
+        if not to_check:
+            return results
+
         # Vérification BAN
         try:
-            ban_score = self._check_ban_address(street, zip, city)
-            # On combine les scores (format et existence)
-            format_score['score'] *= ban_score
-            format_score['details']['ban_valid'] = bool(ban_score > 0.8)
+            ban_scores = self._check_ban_addresses(to_check)
         except Exception:
             # En cas d'erreur de connexion, on garde juste le score de format
-            format_score['details']['ban_valid'] = None
-            
-        return format_score
+            ban_scores = {}
+
+        for key in to_check:
+            details = results[key]['details']
+            if key not in ban_scores:
+                details['ban_valid'] = None
+                continue
+            # On combine les scores (format et existence)
+            results[key]['score'] *= ban_scores[key]
+            details['ban_valid'] = bool(ban_scores[key] > 0.8)
+
+        return results
 
     def _validate_address_format(self, street, zip, city):
         """Validation du format des champs"""
         score = 1.0
+        zip_valid = bool(zip and ZIP_RE.match(zip))
         
-        if not zip or not re.match(r'^\d{5}$', zip):
+        if not zip_valid:
             score *= 0.7
             
         if not city:
             score *= 0.7
         else:
             city = unidecode(city.lower().strip())
-            if not re.match(r'^[a-z\- ]+$', city):
+            if not CITY_RE.match(city):
                 score *= 0.9
                 
         if not street:
             score *= 0.7
         else:
             street = unidecode(street.lower().strip())
-            if not re.search(r'\d+', street):
+            if not DIGITS_RE.search(street):
                 score *= 0.9
-            if not re.match(r'^[a-z0-9\- ]+$', street):
+            if not STREET_RE.match(street):
                 score *= 0.9
                 
         return {
             'score': score,
             'details': {
-                'zip_valid': bool(zip and re.match(r'^\d{5}$', zip)),
+                'zip_valid': zip_valid,
                 'city_valid': bool(city),
                 'street_valid': bool(street),
             }
         }
 
+    def _get_ban_offline_index(self):
+        """Index BAN hors ligne configuré, ou None"""
+        path = self.env['ir.config_parameter'].sudo().get_param('waf_localisation.ban_offline_index_path')
+        return get_offline_index(path)
+
     def _check_ban_address(self, street, zip, city):
-        """Vérifie l'existence de l'adresse dans la BAN"""
-        # TODO: Implémenter l'appel à l'API BAN
-        # Pour l'instant, retourne 1.0 (validation OK)
-        return 1.0
+        """Vérifie l'existence de l'adresse dans la BAN
+
+        Returns:
+            float: Score d'existence, ou None si la BAN n'a pas pu être interrogée
+        """
+        key = (street, zip, city)
+        return self._check_ban_addresses([key]).get(key)
+
+    def _check_ban_addresses(self, addresses):
+        """Vérifie l'existence d'un lot d'adresses ``(street, zip, city)`` dans la BAN
+
+        Utilise l'index hors ligne s'il est configuré
+        (``waf_localisation.ban_offline_index_path``). Sans index, l'API BAN
+        n'est interrogée que si ``waf_localisation.ban_online_check`` est
+        activé : la validation synchrone s'exécute dans la transaction des
+        créations et modifications de contacts. Les adresses non vérifiées
+        sont absentes du résultat (seul le score de format est conservé).
+
+        Returns:
+            dict: Score d'existence par tuple
+        """
+        addresses = list(addresses)
+        index = self._get_ban_offline_index()
+        if index is not None:
+            return {key: index.lookup(*key) for key in addresses}
+        if not self.env['ir.config_parameter'].sudo().get_param('waf_localisation.ban_online_check'):
+            return {}
+
+        service = self.env['res.partner']._get_ban_service()
+        responses = service.search_address_many([
+            {'query': street, 'postcode': zip, 'city': city, 'limit': 1}
+            for street, zip, city in addresses
+        ])
+        scores = {}
+        for key, response in zip(addresses, responses):
+            if response.success:
+                features = (response.data or {}).get('features') or []
+                scores[key] = features[0]['properties'].get('score', 0.0) if features else 0.0
+        return scores
+
+    @api.model
+    def _import_ban_offline_index(self, csv_paths, index_path=None):
+        """Importe des exports CSV départementaux de la BAN dans l'index hors ligne
+
+        Args:
+            csv_paths (list): Chemins des fichiers ``adresses-XX.csv(.gz)``
+            index_path (str): Fichier SQLite de l'index ; par défaut celui
+                configuré, qui est mis à jour sinon
+
+        Returns:
+            int: Nombre d'adresses importées
+        """
+        if not self.env.is_system():
+            raise AccessError(_("Seul un administrateur système peut importer l'index BAN"))
+        params = self.env['ir.config_parameter'].sudo()
+        index_path = index_path or params.get_param('waf_localisation.ban_offline_index_path')
+        if not index_path:
+            raise UserError(_("Aucun chemin d'index BAN hors ligne n'est configuré"))
+        count = BanOfflineIndex.import_csv(csv_paths, index_path)
+        params.set_param('waf_localisation.ban_offline_index_path', index_path)
+        return count
 
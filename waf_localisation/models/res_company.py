@@ -0,0 +1,17 @@
+from odoo import models, fields
+
+
+class ResCompany(models.Model):
+    _inherit = 'res.company'
+
+    address_validation_mode = fields.Selection([
+        ('sync', 'Synchrone'),
+        ('deferred', 'Différée'),
+    ],
+        string="Validation des adresses",
+        default='sync',
+        required=True,
+        help="Synchrone : le score est calculé à l'enregistrement du contact. "
+             "Différée : le contact est mis en file d'attente et validé par "
+             "une tâche planifiée via le géocodage BAN en masse."
+    )
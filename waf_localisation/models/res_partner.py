@@ -1,4 +1,14 @@
+from collections import defaultdict
 from odoo import models, fields, api, _
+from .api.ban_api import BanAPIService
+from .api.cache import TieredCache, get_shared_cache
+import logging
+import threading
+
+_logger = logging.getLogger(__name__)
+
+# Champs dont la modification déclenche une nouvelle validation
+ADDRESS_FIELDS = ('street', 'street2', 'zip', 'city', 'country_id')
 
 
 class ResPartner(models.Model):
@@ -6,11 +16,18 @@ class ResPartner(models.Model):
 
     address_validation_score = fields.Float(
         string='Score de validation (%)',
-        compute='_compute_address_validation_score',
-        store=True,
         default=0.0,
+        readonly=True,
+        copy=False,
         help="Score de validation de l'adresse en pourcentage"
     )
+    address_validation_pending = fields.Boolean(
+        string='Validation en attente',
+        index=True,
+        readonly=True,
+        copy=False,
+        help="L'adresse a changé et attend sa validation différée"
+    )
 
     state_id = fields.Many2one(
         'res.country.state',
@@ -18,28 +35,193 @@ class ResPartner(models.Model):
         domain="[('country_id', '=', country_id)]"
     )
 
-    @api.depends('street', 'street2', 'zip', 'city', 'country_id')
-    def _compute_address_validation_score(self):
-        validator = self.env['address.validation.mixin']
-        for record in self:
-            record.address_validation_score = 0.0
+    @api.model_create_multi
+    def create(self, vals_list):
+        partners = super().create(vals_list)
+        partners._schedule_address_validation()
+        return partners
+
+    def write(self, vals):
+        res = super().write(vals)
+        if any(field in vals for field in ADDRESS_FIELDS):
+            self._schedule_address_validation()
+        return res
+
+    def _is_address_validation_deferred(self):
+        """Indique si la société du contact diffère la validation des adresses"""
+        self.ensure_one()
+        company = self.company_id or self.env.company
+        return company.address_validation_mode == 'deferred'
 
-            if not record.country_id or record.country_id.code != 'FR':
-                continue
+    def _schedule_address_validation(self):
+        """Valide immédiatement ou place en file d'attente selon la société"""
+        deferred = self.filtered(lambda p: p._is_address_validation_deferred())
+        if deferred:
+            deferred.write({'address_validation_pending': True})
+        (self - deferred)._update_address_validation_score()
 
-            if not (record.street and record.zip and record.city):
-                continue
+    def _get_address_validation_scores(self):
+        """Calcul groupé : une validation par adresse distincte du lot
 
-            result = validator._validate_french_address(
-                street=record.street or '',
-                street2=record.street2 or '',
-                zip=record.zip or '',
-                city=record.city or ''
-            )
-            
-            record.address_validation_score = result.get('score', 0.0)
+        Returns:
+            dict: Score par contact
+        """
+        keys = {
+            record: (record.street, record.zip, record.city)
+            for record in self
+            if record.country_id.code == 'FR' and record.street and record.zip and record.city
+        }
+        results = self.env['address.validation.mixin']._validate_french_addresses(keys.values())
+        return {
+            record: results[keys[record]].get('score', 0.0) if record in keys else 0.0
+            for record in self
+        }
+
+    def _write_address_validation_scores(self, scores):
+        """Écrit les scores en une écriture par valeur et sort les contacts de la file
+
+        Args:
+            scores (dict): Score par identifiant de contact
+        """
+        ids_by_score = defaultdict(list)
+        for partner_id, score in scores.items():
+            ids_by_score[round(score, 4)].append(partner_id)
+        for score, ids in ids_by_score.items():
+            self.browse(ids).write({
+                'address_validation_score': score,
+                'address_validation_pending': False,
+            })
+
+    def _update_address_validation_score(self):
+        """Validation synchrone des adresses"""
+        if not self:
+            return
+        scores = self._get_address_validation_scores()
+        self._write_address_validation_scores({partner.id: score for partner, score in scores.items()})
 
     @api.onchange('country_id', 'zip', 'city', 'street', 'street2')
     def _onchange_address_validation(self):
-        """Validation d'adresse en temps réel"""
-        self._compute_address_validation_score()
\ No newline at end of file
+        """Validation d'adresse en temps réel (mode synchrone uniquement)"""
+        if self._is_address_validation_deferred():
+            return
+        self.address_validation_score = self._get_address_validation_scores()[self]
+
+    @api.model
+    def _cron_process_address_validation_queue(self, batch_size=None):
+        """Cron : valide par paquets les adresses en attente via le géocodage BAN en masse
+
+        Les contacts dont le géocodage a échoué restent en attente pour le
+        passage suivant ; la file est parcourue par identifiant croissant.
+        """
+        params = self.env['ir.config_parameter'].sudo()
+        batch_size = batch_size or int(params.get_param('waf_localisation.address_validation_batch_size', 1000))
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+
+        done = 0
+        last_id = 0
+        while True:
+            partners = self.search([
+                ('address_validation_pending', '=', True),
+                ('id', '>', last_id),
+            ], limit=batch_size, order='id')
+            if not partners:
+                break
+            partners._process_address_validation_queue()
+            last_id = partners[-1].id
+            done += len(partners)
+            _logger.info(f"File de validation d'adresses : {done} contacts traités")
+            if auto_commit:
+                self.env.cr.commit()
+        return done
+
+    def _process_address_validation_queue(self):
+        """Traite un paquet de la file d'attente"""
+        geocodable = self.filtered(
+            lambda p: p.country_id.code == 'FR' and p.street and p.zip and p.city
+        )
+        geocodable._geocode_batch_update_scores()
+        # Adresses non françaises ou incomplètes : score nul
+        self._write_address_validation_scores({partner.id: 0.0 for partner in self - geocodable})
+
+    def _get_ban_service(self, **kwargs):
+        """Instancie le service BAN avec le cache partagé du processus
+
+        Le cache mémoire (éventuellement doublé du fichier SQLite désigné par
+        ``waf_localisation.api_cache_path``) est placé devant la table
+        ``ban.geocode.cache``, partagée par tous les workers de la base.
+        """
+        params = self.env['ir.config_parameter'].sudo()
+        front = get_shared_cache(params.get_param('waf_localisation.api_cache_path') or None)
+        cache = TieredCache(front, self.env['ban.geocode.cache'].sudo()._get_cache_backend())
+        return BanAPIService(cache=cache, **kwargs)
+
+    def _get_ban_batch_settings(self):
+        """Paramètres du géocodage en masse (taille des paquets, parallélisme, URL)"""
+        params = self.env['ir.config_parameter'].sudo()
+        return {
+            'chunk_size': int(params.get_param('waf_localisation.ban_batch_chunk_size', BanAPIService.BATCH_CHUNK_SIZE)),
+            'max_workers': int(params.get_param('waf_localisation.ban_batch_max_workers', BanAPIService.BATCH_MAX_WORKERS)),
+            'base_url': params.get_param('waf_localisation.ban_api_url') or None,
+        }
+
+    def _geocode_batch_update_scores(self):
+        """Recalcule les scores de validation en masse via l'endpoint CSV de la BAN
+
+        Les scores sont écrits par paquet, une écriture par valeur de score.
+        Les contacts dont le géocodage a échoué (erreur réseau ou HTTP,
+        disjoncteur ouvert) sont laissés tels quels, en attente le cas échéant.
+
+        Returns:
+            int: Nombre de contacts dont le score a été mis à jour
+        """
+        partners = self.filtered(
+            lambda p: p.country_id.code == 'FR' and p.street and p.zip and p.city
+        )
+        if not partners:
+            return 0
+
+        settings = self._get_ban_batch_settings()
+        service = self._get_ban_service(base_url=settings['base_url'])
+        validator = self.env['address.validation.mixin']
+        format_results = {}
+        format_scores = {}
+        for partner in partners:
+            key = (partner.street, partner.zip, partner.city)
+            if key not in format_results:
+                format_results[key] = validator._validate_address_format(*key)['score']
+            format_scores[partner.id] = format_results[key]
+
+        done = 0
+        for results in service.geocode_batch(
+            partners,
+            chunk_size=settings['chunk_size'],
+            max_workers=settings['max_workers'],
+        ):
+            scores = {}
+            for partner_id, response in results.items():
+                if not response.success:
+                    continue
+                features = (response.data or {}).get('features') or []
+                scores[partner_id] = format_scores[partner_id] * (features[0]['properties']['score'] if features else 0.0)
+            self._write_address_validation_scores(scores)
+            done += len(scores)
+            failed = len(results) - len(scores)
+            if failed:
+                _logger.warning(f"Géocodage BAN en masse : {failed} adresses en échec, conservées en attente")
+            _logger.info(f"Géocodage BAN en masse : {done}/{len(partners)} adresses validées")
+
+        return done
+
+    def action_geocode_batch(self):
+        """Action serveur : validation BAN en masse des contacts sélectionnés"""
+        count = self._geocode_batch_update_scores()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Validation BAN'),
+                'message': _('%s adresses ont été validées', count),
+                'type': 'success',
+                'sticky': False,
+            }
+        }
@@ -1,6 +1,6 @@
 {
     'name': 'W.A.F Pre-SO',
-    'version': '17.0.1.0.0',
+    'version': '17.0.1.1.0',
     'category': 'Sales/Sales',
     'summary': 'Gestion des groupements d\'intérêt et livraisons multiples',
     'description': """
@@ -22,6 +22,7 @@ Fonctionnalités principales :
         'base',
         'sale_management',
         'stock',
+        'sale_stock',
         'mail',
         'waf_tempo',
         'waf_localisation',
@@ -35,6 +36,8 @@ Fonctionnalités principales :
         'views/res_partner_interest_groupment_views.xml',
         'views/res_partner_views.xml',
         'views/sale_order_views.xml',
+        'views/sale_order_split_job_views.xml',
+        'data/ir_cron.xml',
         'views/menu_views.xml',
     ],
     'assets': {},
@@ -0,0 +1,44 @@
+from odoo import api, SUPERUSER_ID
+import logging
+
+_logger = logging.getLogger(__name__)
+
+OLD_TABLE = 'res_partner_res_partner_interest_groupment_rel'
+NEW_TABLE = 'res_partner_interest_groupment_member_rel'
+
+
+def _table_exists(cr, table):
+    cr.execute("SELECT 1 FROM information_schema.tables WHERE table_name = %s", (table,))
+    return bool(cr.fetchone())
+
+
+def migrate(cr, version):
+    """Reprise des adhésions de l'ancienne table de relation de ``member_ids``
+
+    Jusqu'en 17.0.1.0.0, ``res.partner.interest.groupment.member_ids``
+    utilisait la table par défaut de l'ORM ; il partage désormais la table
+    de ``res.partner.member_groupment_ids``. Les adhésions sont recopiées
+    (sans doublon), l'ancienne table est supprimée et les compteurs stockés
+    sont recalculés.
+    """
+    if not version or not _table_exists(cr, OLD_TABLE):
+        return
+
+    cr.execute(f"""
+        INSERT INTO {NEW_TABLE} (groupment_id, partner_id)
+        SELECT res_partner_interest_groupment_id, res_partner_id FROM {OLD_TABLE}
+        ON CONFLICT DO NOTHING
+    """)
+    _logger.info(f"{cr.rowcount} adhésions reprises de {OLD_TABLE} dans {NEW_TABLE}")
+    cr.execute(f"DROP TABLE {OLD_TABLE}")
+
+    env = api.Environment(cr, SUPERUSER_ID, {'active_test': False})
+    cr.execute(f"SELECT DISTINCT groupment_id, partner_id FROM {NEW_TABLE}")
+    rows = cr.fetchall()
+    groupments = env['res.partner.interest.groupment'].browse({groupment_id for groupment_id, _partner_id in rows})
+    partners = env['res.partner'].browse({partner_id for _groupment_id, partner_id in rows})
+    groupments.invalidate_recordset(['member_ids'])
+    partners.invalidate_recordset(['member_groupment_ids'])
+    groupments.modified(['member_ids'])
+    partners.modified(['member_groupment_ids'])
+    env.flush_all()
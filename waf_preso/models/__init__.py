@@ -2,4 +2,8 @@ from . import mixins
 from . import res_partner_interest_type
 from . import res_partner_interest_groupment
 from . import res_partner
-from . import sale_order 
\ No newline at end of file
+from . import sale_order
+from . import sale_order_line
+from . import sale_order_split_job
+from . import sale_order_dispatch_allocation
+from . import stock_picking
@@ -24,7 +24,8 @@ class ResPartner(models.Model):
     )
     interest_group_count = fields.Integer(
         string='Nombre de groupements', 
-        compute='_compute_interest_group_count'
+        compute='_compute_interest_group_count',
+        store=True
     )
     region_id = fields.Many2one('res.region', string='Région')
     state_id = fields.Many2one('res.country.state', string='État/Province')
@@ -41,15 +42,30 @@ class ResPartner(models.Model):
         store=True
     )
 
-    @api.depends('managed_groupment_ids', 'member_groupment_ids')
+    @api.depends('managed_groupment_ids', 'managed_groupment_ids.active',
+                 'member_groupment_ids', 'member_groupment_ids.active')
     def _compute_interest_group_count(self):
-        """Optimisé avec des requêtes directes."""
+        """Groupements actifs gérés ou rejoints : une seule requête agrégée pour tout le lot"""
+        partner_ids = [partner_id for partner_id in self._origin.ids if partner_id]
+        counts = {}
+        if partner_ids:
+            self.env['res.partner.interest.groupment'].flush_model(['agent_id', 'active', 'member_ids'])
+            self.env.cr.execute("""
+                SELECT partner_id, count(*) FROM (
+                    SELECT g.agent_id AS partner_id
+                    FROM res_partner_interest_groupment g
+                    WHERE g.agent_id = ANY(%(ids)s) AND g.active
+                    UNION ALL
+                    SELECT rel.partner_id
+                    FROM res_partner_interest_groupment_member_rel rel
+                    JOIN res_partner_interest_groupment g ON g.id = rel.groupment_id
+                    WHERE rel.partner_id = ANY(%(ids)s) AND g.active
+                ) AS groupments
+                GROUP BY partner_id
+            """, {'ids': partner_ids})
+            counts = dict(self.env.cr.fetchall())
         for partner in self:
-            partner.interest_group_count = (
-                self.env['res.partner.interest.groupment'].search_count([
-                    ('agent_id', '=', partner.id)
-                ]) + len(partner.member_groupment_ids)
-            )
+            partner.interest_group_count = counts.get(partner._origin.id, 0)
 
     @api.constrains('agent_id')
     def _check_groupment_constraints(self):
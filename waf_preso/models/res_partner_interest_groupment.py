@@ -53,8 +53,10 @@ class ResPartnerInterestGroupment(models.Model):
     )
     member_ids = fields.Many2many(
         'res.partner', 
-        string='Membres', 
-        tracking=True
+        'res_partner_interest_groupment_member_rel',
+        'groupment_id',
+        'partner_id',
+        string='Membres'
     )
     member_count = fields.Integer(
         compute='_compute_member_count', 
@@ -87,12 +89,122 @@ class ResPartnerInterestGroupment(models.Model):
 
     @api.constrains('member_ids', 'agent_id')
     def _check_members_and_agent(self):
+        """Vérifié en SQL : la liste des membres n'est pas chargée"""
+        counts = self._get_member_counts()
+        self.env.cr.execute("""
+            SELECT g.id FROM res_partner_interest_groupment g
+            JOIN res_partner_interest_groupment_member_rel rel
+                ON rel.groupment_id = g.id AND rel.partner_id = g.agent_id
+            JOIN res_partner p ON p.id = rel.partner_id AND p.active
+            WHERE g.id = ANY(%s)
+            LIMIT 1
+        """, (self.ids,))
+        if self.env.cr.fetchone():
+            raise ValidationError(_("Le mandataire ne peut pas être membre de son propre groupement"))
         for record in self:
-            if record.agent_id in record.member_ids:
-                raise ValidationError(_("Le mandataire ne peut pas être membre de son propre groupement"))
-            if len(record.member_ids) < 2:
+            if counts.get(record.id, 0) < 2:
                 raise ValidationError(_("Un groupement doit avoir au moins 2 membres"))
 
+    def _get_member_counts(self):
+        """Nombre de membres actifs par groupement, en une requête
+
+        Returns:
+            dict: {groupment_id: nombre de membres}
+        """
+        groupment_ids = [groupment_id for groupment_id in self._origin.ids if groupment_id]
+        if not groupment_ids:
+            return {}
+        self.flush_model(['member_ids', 'agent_id'])
+        self.env['res.partner'].flush_model(['active'])
+        self.env.cr.execute("""
+            SELECT rel.groupment_id, count(*)
+            FROM res_partner_interest_groupment_member_rel rel
+            JOIN res_partner p ON p.id = rel.partner_id AND p.active
+            WHERE rel.groupment_id = ANY(%s)
+            GROUP BY rel.groupment_id
+        """, (groupment_ids,))
+        return dict(self.env.cr.fetchall())
+
+    def write(self, vals):
+        if 'member_ids' not in vals:
+            return super().write(vals)
+        # Suivi résumé des membres : effectifs avant / après plutôt que la liste complète
+        before = self._get_member_counts()
+        res = super().write(vals)
+        after = self._get_member_counts()
+        for record in self:
+            if before.get(record.id, 0) != after.get(record.id, 0):
+                record.message_post(body=_("Membres : %s → %s", before.get(record.id, 0), after.get(record.id, 0)))
+        return res
+
+    def _members_changed(self, partner_ids):
+        """Après une modification SQL de la table des membres : caches, champs dépendants, contraintes"""
+        partners = self.env['res.partner'].browse(partner_ids)
+        self.invalidate_recordset(['member_ids'])
+        partners.invalidate_recordset(['member_groupment_ids'])
+        self.modified(['member_ids'])
+        partners.modified(['member_groupment_ids'])
+        self._check_members_and_agent()
+
+    def add_members(self, partners):
+        """Ajoute des membres directement dans la table de relation
+
+        Les membres existants ne sont ni chargés ni réécrits ; les doublons
+        sont ignorés.
+
+        Args:
+            partners: Partenaires (recordset ou liste d'ids)
+
+        Returns:
+            int: Nombre d'adhésions créées
+        """
+        partner_ids = partners.ids if isinstance(partners, models.BaseModel) else list(partners)
+        if not self or not partner_ids:
+            return 0
+        self.check_access_rights('write')
+        self.check_access_rule('write')
+        self.flush_model(['member_ids'])
+        self.env.cr.execute("""
+            INSERT INTO res_partner_interest_groupment_member_rel (groupment_id, partner_id)
+            SELECT groupment_id, partner_id
+            FROM unnest(%s::int[]) AS groupment_id CROSS JOIN unnest(%s::int[]) AS partner_id
+            ON CONFLICT DO NOTHING
+            RETURNING groupment_id
+        """, (self.ids, partner_ids))
+        added = self._post_member_summary(self.env.cr.fetchall(), _("%s membre(s) ajouté(s)"))
+        self._members_changed(partner_ids)
+        return added
+
+    def remove_members(self, partners):
+        """Retire des membres directement dans la table de relation
+
+        Returns:
+            int: Nombre d'adhésions supprimées
+        """
+        partner_ids = partners.ids if isinstance(partners, models.BaseModel) else list(partners)
+        if not self or not partner_ids:
+            return 0
+        self.check_access_rights('write')
+        self.check_access_rule('write')
+        self.flush_model(['member_ids'])
+        self.env.cr.execute("""
+            DELETE FROM res_partner_interest_groupment_member_rel
+            WHERE groupment_id = ANY(%s) AND partner_id = ANY(%s)
+            RETURNING groupment_id
+        """, (self.ids, partner_ids))
+        removed = self._post_member_summary(self.env.cr.fetchall(), _("%s membre(s) retiré(s)"))
+        self._members_changed(partner_ids)
+        return removed
+
+    def _post_member_summary(self, rows, message):
+        """Un message de suivi par groupement modifié, avec le nombre de membres concernés"""
+        counts = {}
+        for (groupment_id,) in rows:
+            counts[groupment_id] = counts.get(groupment_id, 0) + 1
+        for groupment in self.browse(list(counts)):
+            groupment.message_post(body=message % counts[groupment.id])
+        return sum(counts.values())
+
     @api.depends('sale_order_ids')
     def _compute_sale_order_count(self):
         """Calcule le nombre de commandes liées"""
@@ -112,8 +224,16 @@ class ResPartnerInterestGroupment(models.Model):
 
     @api.depends('member_ids')
     def _compute_member_count(self):
+        """Comptage SQL pour les enregistrements en base ; en mémoire pour les
+        enregistrements ``new`` (formulaire, onchange), dont la liste des
+        membres en cours d'édition n'est pas en base"""
+        stored = self.filtered('id')
+        counts = stored._get_member_counts()
         for record in self:
-            record.member_count = len(record.member_ids)
+            if record.id:
+                record.member_count = counts.get(record.id, 0)
+            else:
+                record.member_count = len(record.member_ids.filtered('active'))
 
     @api.constrains('date_start', 'date_end')
     def _check_dates(self):
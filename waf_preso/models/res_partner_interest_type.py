@@ -15,7 +15,7 @@ class ResPartnerInterestType(models.Model):
     active = fields.Boolean(default=True)
     description = fields.Text(translate=True)
     groupment_ids = fields.One2many('res.partner.interest.groupment', 'interest_type_id', string='Groupements')
-    groupment_count = fields.Integer(string='Nombre de groupements', compute='_compute_groupment_count')
+    groupment_count = fields.Integer(string='Nombre de groupements', compute='_compute_groupment_count', store=True)
     company_id = fields.Many2one('res.company', default=lambda self: self.env.company, required=True)
 
     def action_view_groupments(self):
@@ -29,12 +29,17 @@ class ResPartnerInterestType(models.Model):
             'context': {'default_interest_type_id': self.id},
         }
 
-    @api.depends('groupment_ids')
+    @api.depends('groupment_ids', 'groupment_ids.active')
     def _compute_groupment_count(self):
+        """Groupements actifs par type : valeur stockée, indépendante des règles
+        d'accès de l'utilisateur qui déclenche le calcul et du contexte"""
+        counts = dict(self.env['res.partner.interest.groupment'].sudo().with_context(active_test=False)._read_group(
+            [('interest_type_id', 'in', self._origin.ids), ('active', '=', True)],
+            ['interest_type_id'],
+            ['__count'],
+        ))
         for record in self:
-            record.groupment_count = self.env['res.partner.interest.groupment'].search_count([
-                ('interest_type_id', '=', record.id)
-            ])
+            record.groupment_count = counts.get(record._origin, 0)
 
     _sql_constraints = [
         ('name_company_uniq', 'unique(name, company_id)', 'Le nom doit être unique par société !')
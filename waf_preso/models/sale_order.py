@@ -1,5 +1,5 @@
-from odoo import models, fields, api
-from odoo.exceptions import ValidationError
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError, ValidationError
 
 class SaleOrder(models.Model):
     _inherit = 'sale.order'
@@ -26,6 +26,127 @@ class SaleOrder(models.Model):
         ondelete='restrict'
     )
 
+    split_parent_id = fields.Many2one(
+        'sale.order',
+        string='Commande consolidée',
+        index=True,
+        copy=False,
+        ondelete='set null',
+        help="Commande de groupement dont cette commande est issue"
+    )
+    split_order_ids = fields.One2many(
+        'sale.order',
+        'split_parent_id',
+        string='Commandes des membres'
+    )
+    split_order_count = fields.Integer(
+        string='Commandes des membres',
+        compute='_compute_split_order_count'
+    )
+
+    dispatch_allocation_ids = fields.One2many(
+        'sale.order.dispatch.allocation',
+        'order_id',
+        string='Allocations de livraison'
+    )
+    dispatch_picking_ids = fields.One2many(
+        'stock.picking',
+        'dispatch_order_id',
+        string='Livraisons des membres'
+    )
+    dispatch_picking_count = fields.Integer(
+        string='Livraisons des membres',
+        compute='_compute_dispatch_picking_count'
+    )
+
+    @api.depends('dispatch_picking_ids')
+    def _compute_dispatch_picking_count(self):
+        counts = dict(self.env['stock.picking']._read_group(
+            [('dispatch_order_id', 'in', self._origin.ids)],
+            ['dispatch_order_id'],
+            ['__count'],
+        ))
+        for record in self:
+            record.dispatch_picking_count = counts.get(record._origin, 0)
+
+    @api.depends('split_order_ids')
+    def _compute_split_order_count(self):
+        counts = dict(self._read_group(
+            [('split_parent_id', 'in', self._origin.ids)],
+            ['split_parent_id'],
+            ['__count'],
+        ))
+        for record in self:
+            record.split_order_count = counts.get(record._origin, 0)
+
+    def action_split_by_member(self):
+        """Lance en tâche de fond le split de la commande entre les membres du groupement"""
+        self.ensure_one()
+        Job = self.env['sale.order.split.job']
+        job = Job.search([('order_id', '=', self.id), ('state', '!=', 'done')], limit=1)
+        if not job:
+            job = Job.create({'order_id': self.id})
+        if job.state != 'running':
+            # Un job en cours d'exécution par le cron n'est pas remis en file
+            job.action_start()
+        return {
+            'name': _('Split de commande'),
+            'type': 'ir.actions.act_window',
+            'res_model': 'sale.order.split.job',
+            'view_mode': 'form',
+            'res_id': job.id,
+        }
+
+    def action_view_split_orders(self):
+        self.ensure_one()
+        return {
+            'name': _('Commandes des membres'),
+            'type': 'ir.actions.act_window',
+            'res_model': 'sale.order',
+            'view_mode': 'tree,form',
+            'domain': [('split_parent_id', '=', self.id)],
+        }
+
+    def action_plan_dispatch(self):
+        """Répartit les quantités entre les adresses de livraison des membres
+        et crée ou met à jour les livraisons correspondantes"""
+        stats = self.env['sale.order.dispatch.allocation']._plan(self)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Dispatch des livraisons'),
+                'message': _("%(created)s allocations créées, %(updated)s modifiées, %(cancelled)s annulées",
+                             created=stats.get('created', 0),
+                             updated=stats.get('updated', 0),
+                             cancelled=stats.get('cancelled', 0)),
+                'type': 'success',
+                'sticky': False,
+            },
+        }
+
+    def action_view_dispatch_pickings(self):
+        self.ensure_one()
+        return {
+            'name': _('Livraisons des membres'),
+            'type': 'ir.actions.act_window',
+            'res_model': 'stock.picking',
+            'view_mode': 'tree,form',
+            'domain': [('dispatch_order_id', '=', self.id)],
+        }
+
+    def action_confirm(self):
+        """Une commande consolidée répartie (ou en cours de répartition) entre
+        les membres ne peut plus être confirmée"""
+        splitting = self.env['sale.order.split.job'].sudo().search([
+            ('order_id', 'in', self.ids),
+            ('state', 'in', ('queued', 'running', 'done')),
+        ]).order_id | self.filtered('split_order_ids')
+        if splitting:
+            raise UserError(_("Les commandes suivantes ont été réparties entre les membres du groupement "
+                              "et ne peuvent pas être confirmées : %s", ', '.join(splitting.mapped('name'))))
+        return super().action_confirm()
+
     @api.constrains('agent_id', 'company_id')
     def _check_agent_company(self):
         for record in self:
@@ -0,0 +1,290 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from odoo.tools import float_compare
+from collections import defaultdict
+from ..tools.allocation import allocate
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class SaleOrderDispatchAllocation(models.Model):
+    """Quantité d'une ligne de commande de groupement livrée à un membre
+
+    Le planificateur calcule les allocations de toutes les lignes et de
+    tous les membres en une passe, puis crée les bons de livraison (un par
+    adresse de livraison) et leurs mouvements en lots. Les quantités
+    dispatchées sont prélevées sur les mouvements sortants créés par
+    ``sale_stock`` à la confirmation : les mouvements des membres gardent la
+    ligne de commande et le groupe d'approvisionnement de la commande, qui
+    n'est donc livrée qu'une fois et dont les quantités livrées restent
+    justes. Il est déterministe : relancé après un changement de membres ou
+    de quantités, il ne modifie que les allocations qui diffèrent.
+    """
+    _name = 'sale.order.dispatch.allocation'
+    _description = 'Allocation de livraison de groupement'
+    _order = 'order_id, order_line_id, partner_id'
+
+    order_id = fields.Many2one(
+        'sale.order',
+        string='Commande',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+    order_line_id = fields.Many2one(
+        'sale.order.line',
+        string='Ligne de commande',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+    partner_id = fields.Many2one(
+        'res.partner',
+        string='Membre',
+        required=True,
+        index=True
+    )
+    partner_shipping_id = fields.Many2one(
+        'res.partner',
+        string='Adresse de livraison',
+        required=True
+    )
+    product_id = fields.Many2one(related='order_line_id.product_id', store=True)
+    product_uom = fields.Many2one(related='order_line_id.product_uom')
+    quantity = fields.Float(string='Quantité', digits='Product Unit of Measure')
+    move_id = fields.Many2one('stock.move', string='Mouvement', ondelete='set null', index=True)
+    picking_id = fields.Many2one(related='move_id.picking_id', store=True, string='Bon de livraison')
+
+    _sql_constraints = [
+        ('line_partner_unique',
+         'UNIQUE(order_line_id, partner_id)',
+         'Une seule allocation par ligne de commande et par membre !')
+    ]
+
+    @api.model
+    def _compute_targets(self, order, frozen=None):
+        """Allocations attendues : {(ligne, membre): (quantité, adresse de livraison)}
+
+        Les membres sont pris dans un ordre stable (mandataire exclu) et les
+        quantités réparties par la méthode du plus fort reste. Les quantités
+        déjà livrées (``frozen`` : {(ligne, membre): quantité}) sont déduites
+        de la ligne, dont le reste est réparti entre les autres membres.
+        """
+        frozen = frozen or {}
+        groupment = order.interest_groupment_id
+        members = groupment.member_ids.filtered(lambda partner: partner != groupment.agent_id).sorted('id')
+        lines = order.order_line.filtered(
+            lambda line: not line.display_type and line.product_id.type in ('product', 'consu')
+        )
+        shipping = {member.id: member.address_get(['delivery'])['delivery'] for member in members}
+
+        targets = {}
+        for line in lines:
+            pending = members.filtered(lambda member: (line.id, member.id) not in frozen)
+            delivered = sum(quantity for (line_id, _partner_id), quantity in frozen.items() if line_id == line.id)
+            rounding = line.product_uom.rounding or 1.0
+            remaining = line.product_uom_qty - delivered
+            if not pending or float_compare(remaining, 0.0, precision_rounding=rounding) <= 0:
+                continue
+            quantities = allocate(remaining, [1.0] * len(pending), rounding)
+            for member, quantity in zip(pending, quantities):
+                if quantity:
+                    targets[(line.id, member.id)] = (quantity, shipping[member.id])
+        return targets
+
+    @api.model
+    def _plan(self, orders):
+        """Planifie (ou replanifie) le dispatch des commandes de groupement
+
+        Returns:
+            dict: Nombre d'allocations créées, modifiées et annulées
+        """
+        stats = defaultdict(int)
+        for order in orders:
+            if not order.interest_groupment_id:
+                raise UserError(_("La commande %s n'est liée à aucun groupement", order.name))
+            if order.state != 'sale':
+                raise UserError(_("La commande %s doit être confirmée pour planifier son dispatch", order.name))
+            for key, count in self._plan_order(order).items():
+                stats[key] += count
+        return dict(stats)
+
+    def _plan_order(self, order):
+        """Rapproche les allocations existantes des allocations attendues pour une commande"""
+        existing = {
+            (allocation.order_line_id.id, allocation.partner_id.id): allocation
+            for allocation in self.search([('order_id', '=', order.id)])
+        }
+        # Déjà livrées : les allocations sont figées
+        frozen = {key: allocation.quantity for key, allocation in existing.items() if allocation.move_id.state == 'done'}
+        targets = self._compute_targets(order, frozen)
+
+        obsolete = self.browse()
+        updates = defaultdict(lambda: self.browse())  # quantité -> allocations
+        line_deltas = defaultdict(float)  # ligne -> quantité à prélever sur les mouvements de la commande
+        for key, allocation in existing.items():
+            if key in frozen:
+                continue
+            target = targets.get(key)
+            if not target or target[1] != allocation.partner_shipping_id.id:
+                obsolete |= allocation
+                line_deltas[key[0]] -= allocation.quantity
+            elif target[0] != allocation.quantity:
+                updates[target[0]] |= allocation
+                line_deltas[key[0]] += target[0] - allocation.quantity
+
+        new_keys = sorted(key for key in targets if key not in existing or existing[key] in obsolete)
+        for key in new_keys:
+            line_deltas[key[0]] += targets[key][0]
+
+        moves_to_cancel = obsolete.move_id.filtered(lambda move: move.state not in ('done', 'cancel'))
+        if moves_to_cancel:
+            moves_to_cancel._action_cancel()
+        obsolete.unlink()
+
+        # Les quantités dispatchées quittent les mouvements de la commande avant
+        # la réservation des mouvements des membres
+        self._consume_order_moves(order, line_deltas)
+
+        updated_moves = self.env['stock.move']
+        for quantity, allocations in updates.items():
+            moves = allocations.move_id.filtered(lambda move: move.state not in ('done', 'cancel'))
+            moves._do_unreserve()
+            allocations.write({'quantity': quantity})
+            moves.write({'product_uom_qty': quantity})
+            updated_moves |= moves
+        if updated_moves:
+            updated_moves._action_assign()
+
+        self._create_allocations(order, [(key, targets[key]) for key in new_keys])
+        return {
+            'created': len(new_keys),
+            'updated': sum(len(allocations) for allocations in updates.values()),
+            'cancelled': len(obsolete),
+        }
+
+    def _get_order_moves(self, order):
+        """Mouvements sortants ouverts de la commande non encore dispatchés, par ligne
+
+        Les mouvements des bons de dispatch et de leurs reliquats (qui ne
+        reprennent pas ``dispatch_order_id``) appartiennent aux membres.
+        """
+        dispatched = self.search([('order_id', '=', order.id)]).move_id
+
+        def is_dispatch_picking(picking):
+            while picking:
+                if picking.dispatch_order_id:
+                    return True
+                picking = picking.backorder_id
+            return False
+
+        moves = order.order_line.move_ids.filtered(
+            lambda move: move.state not in ('done', 'cancel')
+            and move.picking_code == 'outgoing'
+            and move not in dispatched
+            and not is_dispatch_picking(move.picking_id)
+        )
+        moves_by_line = defaultdict(lambda: self.env['stock.move'])
+        for move in moves.sorted('id'):
+            moves_by_line[move.sale_line_id.id] |= move
+        return moves_by_line
+
+    def _consume_order_moves(self, order, line_deltas):
+        """Prélève sur les mouvements de la commande les quantités dispatchées
+
+        Un mouvement entièrement prélevé est annulé. Une quantité rendue
+        (diminution du total dispatché d'une ligne) n'est pas remise sur les
+        mouvements de la commande : elle correspond à une baisse de la
+        quantité commandée.
+        """
+        moves_by_line = self._get_order_moves(order)
+        lines = self.env['sale.order.line'].browse([line_id for line_id, delta in line_deltas.items() if delta > 0])
+        to_cancel = self.env['stock.move']
+        to_assign = self.env['stock.move']
+        for line in lines:
+            remaining = line_deltas[line.id]
+            rounding = line.product_uom.rounding
+            for move in moves_by_line[line.id]:
+                if float_compare(remaining, 0.0, precision_rounding=rounding) <= 0:
+                    break
+                available = move.product_uom._compute_quantity(move.product_uom_qty, line.product_uom)
+                taken = min(available, remaining)
+                remaining -= taken
+                move._do_unreserve()
+                if float_compare(available, taken, precision_rounding=rounding) <= 0:
+                    to_cancel |= move
+                else:
+                    move.product_uom_qty = line.product_uom._compute_quantity(available - taken, move.product_uom)
+                    to_assign |= move
+            if float_compare(remaining, 0.0, precision_rounding=rounding) > 0:
+                _logger.warning(f"Dispatch {order.name} : {remaining} {line.product_uom.name} de "
+                                f"{line.product_id.display_name} sans mouvement de la commande à prélever")
+        if to_cancel:
+            to_cancel._action_cancel()
+        if to_assign:
+            to_assign._action_assign()
+
+    def _create_allocations(self, order, items):
+        """Crée en lots les bons de livraison manquants, les mouvements et les allocations"""
+        if not items:
+            return self.browse()
+
+        picking_type = order.warehouse_id.out_type_id
+        location_src = picking_type.default_location_src_id
+        location_dest = self.env.ref('stock.stock_location_customers')
+        Picking = self.env['stock.picking'].with_context(tracking_disable=True, mail_create_nolog=True)
+
+        pickings = {
+            picking.partner_id.id: picking
+            for picking in Picking.search([
+                ('dispatch_order_id', '=', order.id),
+                ('picking_type_id', '=', picking_type.id),
+                ('state', 'not in', ('done', 'cancel')),
+            ])
+        }
+        missing_addresses = sorted({shipping_id for _key, (_quantity, shipping_id) in items} - set(pickings))
+        new_pickings = Picking.create([{
+            'partner_id': shipping_id,
+            'picking_type_id': picking_type.id,
+            'location_id': location_src.id,
+            'location_dest_id': location_dest.id,
+            'origin': order.name,
+            'company_id': order.company_id.id,
+            'dispatch_order_id': order.id,
+        } for shipping_id in missing_addresses])
+        pickings.update({picking.partner_id.id: picking for picking in new_pickings})
+
+        lines = self.env['sale.order.line'].browse([line_id for (line_id, _partner_id), _target in items])
+        lines_by_id = {line.id: line for line in lines}
+        moves = self.env['stock.move'].create([{
+            'name': lines_by_id[line_id].name,
+            'product_id': lines_by_id[line_id].product_id.id,
+            'product_uom': lines_by_id[line_id].product_uom.id,
+            'product_uom_qty': quantity,
+            'picking_id': pickings[shipping_id].id,
+            'picking_type_id': picking_type.id,
+            'partner_id': shipping_id,
+            'location_id': location_src.id,
+            'location_dest_id': location_dest.id,
+            'origin': order.name,
+            'company_id': order.company_id.id,
+            'warehouse_id': order.warehouse_id.id,
+            'sale_line_id': line_id,
+            'group_id': order.procurement_group_id.id,
+        } for (line_id, _partner_id), (quantity, shipping_id) in items])
+
+        allocations = self.create([{
+            'order_id': order.id,
+            'order_line_id': line_id,
+            'partner_id': partner_id,
+            'partner_shipping_id': shipping_id,
+            'quantity': quantity,
+            'move_id': move.id,
+        } for ((line_id, partner_id), (quantity, shipping_id)), move in zip(items, moves)])
+
+        # Confirmation groupée, sans fusion : un mouvement par allocation
+        moves._action_confirm(merge=False)
+        moves._action_assign()
+        _logger.info(f"Dispatch {order.name} : {len(moves)} mouvements, {len(new_pickings)} nouveaux bons de livraison")
+        return allocations
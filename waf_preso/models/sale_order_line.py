@@ -0,0 +1,14 @@
+from odoo import models, fields
+
+
+class SaleOrderLine(models.Model):
+    _inherit = 'sale.order.line'
+
+    split_parent_line_id = fields.Many2one(
+        'sale.order.line',
+        string='Ligne consolidée',
+        index=True,
+        copy=False,
+        ondelete='set null',
+        help="Ligne de la commande de groupement dont cette ligne est issue"
+    )
@@ -0,0 +1,222 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+from ..tools.allocation import allocate
+import logging
+import threading
+
+_logger = logging.getLogger(__name__)
+
+
+class SaleOrderSplitJob(models.Model):
+    """Split d'une commande consolidée de groupement en commandes par membre
+
+    Le traitement s'exécute en tâche de fond (cron), par lots de membres :
+    les valeurs des commandes et des lignes sont construites en mémoire puis
+    créées en un seul ``create`` par lot, sans onchange. Les quantités de
+    chaque ligne sont réparties entre les membres par la méthode du plus
+    fort reste. Un membre disposant déjà de sa commande est ignoré et seul
+    le reste des lignes est réparti entre les autres : le job peut être
+    relancé après une interruption.
+    """
+    _name = 'sale.order.split.job'
+    _description = 'Split de commande de groupement'
+    _inherit = ['mail.thread']
+    _order = 'id desc'
+
+    name = fields.Char(string='Nom', compute='_compute_name', store=True)
+    order_id = fields.Many2one(
+        'sale.order',
+        string='Commande consolidée',
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+    groupment_id = fields.Many2one(
+        related='order_id.interest_groupment_id',
+        store=True,
+        string="Groupement d'intérêt"
+    )
+    state = fields.Selection([
+        ('draft', 'Brouillon'),
+        ('queued', 'En attente'),
+        ('running', 'En cours'),
+        ('done', 'Terminé'),
+        ('failed', 'Echec')
+    ],
+        string='État',
+        default='draft',
+        required=True,
+        tracking=True,
+        index=True
+    )
+    batch_size = fields.Integer(string='Membres par lot', default=50)
+    member_total = fields.Integer(string='Membres', readonly=True)
+    member_done = fields.Integer(string='Membres traités', readonly=True)
+    progress = fields.Float(string='Progression', compute='_compute_progress')
+    error_message = fields.Text(string='Erreur', readonly=True)
+    company_id = fields.Many2one(related='order_id.company_id', store=True)
+
+    @api.depends('order_id.name')
+    def _compute_name(self):
+        for job in self:
+            job.name = _("Split %s", job.order_id.name or '')
+
+    @api.depends('member_total', 'member_done')
+    def _compute_progress(self):
+        for job in self:
+            job.progress = 100.0 * job.member_done / job.member_total if job.member_total else 0.0
+
+    def action_start(self):
+        """Met les jobs en file d'attente et déclenche le cron
+
+        Les commandes des membres sont créées par le cron : les droits de
+        création de l'utilisateur sont vérifiés ici.
+        """
+        self.env['sale.order'].check_access_rights('create')
+        for job in self:
+            if not job.groupment_id:
+                raise UserError(_("La commande %s n'est liée à aucun groupement", job.order_id.name))
+            if job.state == 'running':
+                raise UserError(_("Le split de la commande %s est déjà en cours", job.order_id.name))
+            if job.order_id.state not in ('draft', 'sent'):
+                raise UserError(_("Seul un devis peut être réparti entre les membres (commande %s)", job.order_id.name))
+        self.write({'state': 'queued', 'error_message': False})
+        self.env.ref('waf_preso.ir_cron_sale_order_split')._trigger()
+        return True
+
+    @api.model
+    def _cron_process_jobs(self, limit=5):
+        """Cron : traite les jobs en attente ou interrompus"""
+        jobs = self.search([('state', 'in', ('queued', 'running'))], limit=limit, order='id')
+        for job in jobs:
+            job._run()
+        return len(jobs)
+
+    def _get_members(self):
+        """Membres du groupement, dans un ordre stable (mandataire exclu)"""
+        self.ensure_one()
+        return self.groupment_id.member_ids.filtered(lambda partner: partner != self.groupment_id.agent_id).sorted('id')
+
+    def _get_line_allocations(self, members):
+        """Quantités de chaque ligne par membre à traiter : {ligne: [quantité par membre]}
+
+        Les quantités déjà portées par les commandes des membres traités sont
+        déduites de chaque ligne avant la répartition du reste.
+        """
+        self.ensure_one()
+        lines = self.order_id.order_line.filtered(lambda line: not line.display_type)
+        split_quantities = {
+            parent_line.id: quantity
+            for parent_line, quantity in self.env['sale.order.line']._read_group(
+                [('split_parent_line_id', 'in', lines.ids), ('order_id.split_parent_id', '=', self.order_id.id)],
+                ['split_parent_line_id'],
+                ['product_uom_qty:sum'],
+            )
+        }
+        weights = [1.0] * len(members)
+        return {
+            line: allocate(
+                max(line.product_uom_qty - split_quantities.get(line.id, 0.0), 0.0),
+                weights,
+                line.product_uom.rounding or 1.0,
+            )
+            for line in lines
+        }
+
+    def _prepare_line_values(self, line, quantity):
+        """Valeurs d'une ligne de commande membre : les valeurs calculées de la
+        commande consolidée (prix, taxes, libellé) sont reprises telles quelles"""
+        return {
+            'sequence': line.sequence,
+            'display_type': line.display_type,
+            'name': line.name,
+            'product_id': line.product_id.id,
+            'product_uom': line.product_uom.id,
+            'product_uom_qty': quantity,
+            'price_unit': line.price_unit,
+            'discount': line.discount,
+            'tax_id': [(6, 0, line.tax_id.ids)],
+            'split_parent_line_id': line.id,
+        }
+
+    def _prepare_order_values(self, member, position, allocations):
+        """Valeurs de la commande d'un membre, ou None si aucune quantité ne lui revient"""
+        order = self.order_id
+        lines = []
+        for line in order.order_line:
+            if line.display_type:
+                lines.append((0, 0, self._prepare_line_values(line, 0.0)))
+                continue
+            quantity = allocations[line][position]
+            if quantity:
+                lines.append((0, 0, self._prepare_line_values(line, quantity)))
+        if not any(values.get('product_id') for _command, _id, values in lines):
+            return None
+
+        addresses = member.address_get(['invoice', 'delivery'])
+        return {
+            'partner_id': member.id,
+            'partner_invoice_id': addresses['invoice'],
+            'partner_shipping_id': addresses['delivery'],
+            'company_id': order.company_id.id,
+            'pricelist_id': order.pricelist_id.id,
+            'currency_id': order.currency_id.id,
+            'payment_term_id': order.payment_term_id.id,
+            'fiscal_position_id': order.fiscal_position_id.id,
+            'user_id': order.user_id.id,
+            'team_id': order.team_id.id,
+            'agent_id': order.agent_id.id,
+            'interest_groupment_id': order.interest_groupment_id.id,
+            'split_parent_id': order.id,
+            'origin': order.name,
+            'order_line': lines,
+        }
+
+    def _run(self):
+        """Crée les commandes des membres, par lots, en validant chaque lot
+
+        Une fois tous les membres traités, la commande consolidée est annulée :
+        ses quantités sont désormais portées par les commandes des membres.
+        """
+        self.ensure_one()
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        SaleOrder = self.env['sale.order'].with_context(
+            tracking_disable=True,
+            mail_create_nolog=True,
+            mail_notrack=True,
+        )
+        try:
+            members = self._get_members()
+            done_partners = set(SaleOrder.search([('split_parent_id', '=', self.order_id.id)]).partner_id.ids)
+            # Les partenaires sortis du groupement depuis un précédent passage ne comptent plus
+            done_partners &= set(members.ids)
+            self.write({'state': 'running', 'member_total': len(members), 'member_done': len(done_partners)})
+
+            pending_members = members.filtered(lambda member: member.id not in done_partners)
+            allocations = self._get_line_allocations(pending_members)
+            pending = list(enumerate(pending_members))
+            batch_size = max(1, self.batch_size)
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+                vals_list = [
+                    values for values in (
+                        self._prepare_order_values(member, position, allocations) for position, member in batch
+                    ) if values
+                ]
+                SaleOrder.create(vals_list)
+                self.member_done += len(batch)
+                _logger.info(f"{self.name} : {self.member_done}/{self.member_total} membres traités")
+                if auto_commit:
+                    self.env.cr.commit()
+
+            self.order_id._action_cancel()
+            self.state = 'done'
+        except Exception as e:
+            if auto_commit:
+                self.env.cr.rollback()
+            _logger.exception(f"{self.name} : échec du split")
+            self.write({'state': 'failed', 'error_message': str(e)})
+            if not auto_commit:
+                raise
+        if auto_commit:
+            self.env.cr.commit()
@@ -0,0 +1,14 @@
+from odoo import models, fields
+
+
+class StockPicking(models.Model):
+    _inherit = 'stock.picking'
+
+    dispatch_order_id = fields.Many2one(
+        'sale.order',
+        string='Commande de groupement',
+        index=True,
+        copy=False,
+        ondelete='set null',
+        help="Commande de groupement dont la livraison a été dispatchée vers ce membre"
+    )
@@ -0,0 +1,45 @@
+from typing import List, Sequence
+import math
+
+
+def allocate_units(units: int, weights: Sequence[float]) -> List[int]:
+    """Répartit un nombre entier d'unités selon des poids (méthode du plus fort reste)
+
+    Le résultat est déterministe : à reste égal, la première position
+    l'emporte. La somme des parts est toujours égale à ``units``.
+    """
+    count = len(weights)
+    if not count:
+        return []
+    if units < 0:
+        return [-share for share in allocate_units(-units, weights)]
+
+    total_weight = sum(weights)
+    if total_weight <= 0:
+        weights, total_weight = [1] * count, count
+
+    quotas = [units * weight / total_weight for weight in weights]
+    # La tolérance absorbe les erreurs d'arrondi des quotas entiers (3 × 1/3...)
+    shares = [int(math.floor(quota + 1e-9)) for quota in quotas]
+    remaining = units - sum(shares)
+    by_remainder = sorted(range(count), key=lambda position: (-(quotas[position] - shares[position]), position))
+    for position in by_remainder[:remaining]:
+        shares[position] += 1
+    return shares
+
+
+def allocate(total: float, weights: Sequence[float], precision: float = 1.0) -> List[float]:
+    """Répartit une quantité selon des poids, par multiples de ``precision``
+
+    Args:
+        total: Quantité à répartir
+        weights: Poids de chaque destinataire
+        precision: Plus petite quantité répartissable (arrondi de l'unité de mesure)
+
+    Returns:
+        list: Quantités, dans l'ordre des poids, dont la somme vaut ``total``
+        arrondi à ``precision``
+    """
+    digits = max(0, -int(math.floor(math.log10(precision)))) if precision < 1 else 0
+    units = int(round(total / precision))
+    return [round(share * precision, digits) for share in allocate_units(units, weights)]
@@ -11,15 +11,13 @@
         Fonctionnalités :
         - Gestion des périodes
         - Gestion des jours ouvrés et des dates fériées
-        - Support des calendriers nationaux via workalendar
+        - Jours fériés français (métropole, outre-mer, Alsace-Moselle) intégrés
+        - Autres calendriers nationaux via workalendar (facultatif)
     """,
     'depends': [
         'base',
         'mail',
     ],
-    'external_dependencies': {
-        'python': ['workalendar'],
-    },
     'data': [
         'security/security.xml',
         'security/ir.model.access.csv',
@@ -28,6 +26,7 @@
         # Data
         'data/calendar_region_data.xml',
         'data/calendar_holiday_data.xml',
+        'data/ir_cron.xml',
     ],
     'installable': True,
     'application': False,
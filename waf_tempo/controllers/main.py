@@ -0,0 +1,155 @@
+from odoo import http, fields
+from odoo.http import request
+from datetime import date, datetime, timedelta
+from ..tools.holiday_cache import LRUCache
+import hashlib
+import json
+
+# Corps de réponse déjà rendus, par ETag
+_rendered = LRUCache(max_entries=256)
+
+
+class TempoCalendarController(http.Controller):
+    """Export des jours fériés et des jours ouvrés par calendrier
+
+    ``code`` désigne une région (``GP``, ``67``...) ou, à défaut, un pays
+    (``FR``). Les réponses portent un ETag fort dérivé de la version des
+    données de jours fériés (et, pour l'iCalendar, de leur date de dernière
+    modification, reprise en ``DTSTAMP``) et peuvent être mises en cache par
+    les navigateurs et les proxies.
+    """
+
+    MAX_YEARS = 20
+    MIN_YEAR = 1900
+    MAX_YEAR = 2200
+    CACHE_MAX_AGE = 3600
+    ICS_LINE_OCTETS = 75
+
+    def _get_calendar(self, code):
+        code = (code or '').upper()
+        region = request.env['calendar.region'].sudo().search([('code', '=', code)], limit=1)
+        if region:
+            return region.country_id, region
+        country = request.env['res.country'].sudo().search([('code', '=', code)], limit=1)
+        return country, request.env['calendar.region']
+
+    def _get_years(self, year_from, year_to):
+        """Plage d'années demandée, limitée à ``MAX_YEARS`` années
+
+        Raises:
+            ValueError: Année invalide ou hors de [``MIN_YEAR``, ``MAX_YEAR``]
+        """
+        first_year = int(year_from or fields.Date.today().year)
+        last_year = max(int(year_to or first_year), first_year)
+        last_year = min(last_year, first_year + self.MAX_YEARS - 1)
+        if first_year < self.MIN_YEAR or last_year > self.MAX_YEAR:
+            raise ValueError(f"Années hors de la plage {self.MIN_YEAR}-{self.MAX_YEAR}")
+        return first_year, last_year
+
+    @http.route('/waf_tempo/calendar/<string:code>.<any(json,ics):fmt>', type='http', auth='public', methods=['GET'])
+    def calendar_export(self, code, fmt, year_from=None, year_to=None, **kw):
+        try:
+            first_year, last_year = self._get_years(year_from, year_to)
+        except ValueError:
+            return request.not_found()
+        country, region = self._get_calendar(code)
+        if not country:
+            return request.not_found()
+
+        mixin = request.env['business.day.mixin'].sudo()
+        Holiday = request.env['calendar.holiday'].sudo()
+        version = Holiday._get_holiday_data_version()
+        key = f"{request.env.cr.dbname}:{version}:{country.code}:{region.code or ''}:{first_year}:{last_year}:{fmt}"
+        dtstamp = None
+        if fmt == 'ics':
+            # Le corps iCalendar dépend aussi de son DTSTAMP
+            dtstamp = (Holiday._get_holiday_data_date() or datetime(first_year, 1, 1)).strftime('%Y%m%dT%H%M%SZ')
+            key = f"{key}:{dtstamp}"
+        etag = hashlib.md5(key.encode()).hexdigest()
+        headers = [
+            ('ETag', f'"{etag}"'),
+            ('Cache-Control', f'public, max-age={self.CACHE_MAX_AGE}'),
+        ]
+        if request.httprequest.if_none_match.contains_weak(etag):
+            return request.make_response('', headers=headers, status=304)
+
+        body = _rendered.get(etag)
+        if body is None:
+            holidays = {}
+            for year in range(first_year, last_year + 1):
+                holidays.update(mixin._get_holidays_for(country, region, year))
+            if fmt == 'ics':
+                body = self._render_ics(code.upper(), holidays, dtstamp)
+            else:
+                index = mixin._get_holiday_index_for(country, region, first_year, last_year)
+                body = self._render_json(code.upper(), first_year, last_year, holidays, index)
+            body = _rendered.setdefault(etag, body)
+
+        content_type = 'text/calendar; charset=utf-8' if fmt == 'ics' else 'application/json; charset=utf-8'
+        return request.make_response(body, headers=headers + [('Content-Type', content_type)])
+
+    def _render_json(self, code, first_year, last_year, holidays, index):
+        """JSON compact : jours fériés et, par année, une chaîne de 0/1 (1 = jour ouvré) par jour"""
+        working_days = {}
+        for year in range(first_year, last_year + 1):
+            start, end = date(year, 1, 1), date(year, 12, 31)
+            non_working = set(index.non_working_days(start, end))
+            working_days[str(year)] = ''.join(
+                '0' if start + timedelta(days=offset) in non_working else '1'
+                for offset in range((end - start).days + 1)
+            )
+        return json.dumps({
+            'calendar': code,
+            'years': [first_year, last_year],
+            'holidays': [[day.isoformat(), name] for day, name in sorted(holidays.items())],
+            'working_days': working_days,
+        }, ensure_ascii=False, separators=(',', ':'))
+
+    def _fold_ics_line(self, line):
+        """Plie une ligne iCalendar en segments de 75 octets au plus (RFC 5545, 3.1)"""
+        encoded = line.encode('utf-8')
+        if len(encoded) <= self.ICS_LINE_OCTETS:
+            return line
+        segments = []
+        current, size = [], 0
+        limit = self.ICS_LINE_OCTETS
+        for char in line:
+            char_size = len(char.encode('utf-8'))
+            if size + char_size > limit:
+                segments.append(''.join(current))
+                # Les lignes de continuation commencent par une espace
+                current, size, limit = [], 0, self.ICS_LINE_OCTETS - 1
+            current.append(char)
+            size += char_size
+        segments.append(''.join(current))
+        return '\r\n '.join(segments)
+
+    def _render_ics(self, code, holidays, dtstamp):
+        """Calendrier iCalendar (RFC 5545), un événement sur la journée par jour férié
+
+        ``dtstamp`` (UTC, ``AAAAMMJJTHHMMSSZ``) est dérivé des données et non
+        de l'heure de génération : le corps ne dépend que de la clé de l'ETag.
+        """
+        def escape(text):
+            return text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+        lines = [
+            'BEGIN:VCALENDAR',
+            'VERSION:2.0',
+            'PRODID:-//Dorevia//WAF Tempo//FR',
+            'CALSCALE:GREGORIAN',
+            f'X-WR-CALNAME:Jours fériés {code}',
+        ]
+        for day, name in sorted(holidays.items()):
+            lines += [
+                'BEGIN:VEVENT',
+                f'UID:{day.strftime("%Y%m%d")}-{code}@waf_tempo',
+                f'DTSTAMP:{dtstamp}',
+                f'DTSTART;VALUE=DATE:{day.strftime("%Y%m%d")}',
+                f'DTEND;VALUE=DATE:{(day + timedelta(days=1)).strftime("%Y%m%d")}',
+                f'SUMMARY:{escape(name)}',
+                'TRANSP:TRANSPARENT',
+                'END:VEVENT',
+            ]
+        lines.append('END:VCALENDAR')
+        return '\r\n'.join(self._fold_ics_line(line) for line in lines) + '\r\n'
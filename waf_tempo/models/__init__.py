@@ -1,4 +1,6 @@
 from . import mixins
 from . import calendar_region
 from . import calendar_holiday
+from . import calendar_holiday_occurrence
+from . import business_day_service
 
@@ -0,0 +1,70 @@
+from odoo import models, fields, api
+
+
+class BusinessDayService(models.AbstractModel):
+    """Calculs de jours ouvrés par lots, sans enregistrement porteur
+
+    Service sans état destiné aux planifications (dates de livraison des
+    lignes de commande...). Les calendriers sont ceux du
+    ``business.day.mixin`` : jours fériés précalculés et mis en cache par
+    calendrier et par année.
+    """
+    _name = 'business.day.service'
+    _description = 'Service de calcul des jours ouvrés'
+
+    # Au moins 200 jours ouvrés par an : marge d'années à indexer autour des dates
+    WORKING_DAYS_PER_YEAR = 200
+
+    @api.model
+    def _get_calendar(self, region=None, country=None):
+        """Pays et région du calendrier ; la région détermine le pays, la France par défaut"""
+        region = self.env['calendar.region'].browse(region) if isinstance(region, int) else (region or self.env['calendar.region'])
+        country = self.env['res.country'].browse(country) if isinstance(country, int) else country
+        return country or region.country_id or self.env.ref('base.fr'), region
+
+    @api.model
+    def _get_index(self, dates, region, country, span_days=0):
+        country, region = self._get_calendar(region, country)
+        span = span_days // self.WORKING_DAYS_PER_YEAR + 1
+        return self.env['business.day.mixin']._get_holiday_index_for(
+            country, region, min(dates).year - span, max(dates).year + span
+        )
+
+    @api.model
+    def add_business_days_many(self, dates, days, region=None, country=None):
+        """Ajoute des jours ouvrés (retranche si négatif) à une liste de dates
+
+        Args:
+            dates: Dates de départ
+            days: Nombre de jours ouvrés, commun ou un par date
+            region: Région du calendrier (enregistrement ou id)
+            country: Pays du calendrier si pas de région (France par défaut)
+
+        Returns:
+            list: Dates obtenues, dans l'ordre des dates de départ
+        """
+        dates = [fields.Date.to_date(day) for day in dates]
+        if not dates:
+            return []
+        days = list(days) if isinstance(days, (list, tuple)) else [days] * len(dates)
+        index = self._get_index(dates, region, country, max(abs(count) for count in days))
+        return [index.add_working_days(day, count) for day, count in zip(dates, days)]
+
+    @api.model
+    def business_days_between_many(self, starts, ends, region=None, country=None):
+        """Nombres de jours ouvrés de ``]start, end]`` pour des listes de dates"""
+        starts = [fields.Date.to_date(day) for day in starts]
+        ends = [fields.Date.to_date(day) for day in ends]
+        if not starts:
+            return []
+        index = self._get_index(starts + ends, region, country)
+        return index.working_days_delta_many(starts, ends)
+
+    @api.model
+    def next_business_day_many(self, dates, region=None, country=None):
+        """Premier jour ouvré à partir de chaque date (la date elle-même si elle est ouvrée)"""
+        dates = [fields.Date.to_date(day) for day in dates]
+        if not dates:
+            return []
+        index = self._get_index(dates, region, country)
+        return [day if index.is_working_day(day) else index.add_working_days(day, 1) for day in dates]
@@ -1,14 +1,16 @@
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
 from odoo.exceptions import ValidationError
+from collections import defaultdict
 from datetime import date, timedelta
-from workalendar.europe import France
 from datetime import datetime
-from dateutil.easter import easter
+from ..tools.french_holidays import AlsaceMoselleHolidays, FrenchHolidays, easter_date
+
+# Bas-Rhin, Haut-Rhin et Moselle
+ALSACE_MOSELLE_CODES = ('67', '68', '57')
+
+# Version des données de jours fériés, par base : {base: (horodatage, version)}
+_data_versions = {}
 
-class AlsaceMoselleCalendar(France):
-    """Calendrier spécifique pour l'Alsace-Moselle"""
-    include_good_friday = True
-    include_boxing_day = True
 
 class CalendarHoliday(models.Model):
     _name = 'calendar.holiday'
@@ -52,6 +54,41 @@ class CalendarHoliday(models.Model):
     active = fields.Boolean(default=True, tracking=True, help="Indique si le jour férié est actif")
     display_name = fields.Char(string='Nom affiché', compute='_compute_display_name', help="Nom affiché du jour férié")
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['calendar.holiday.occurrence']._refresh_regions(records.region_id)
+        self._invalidate_holiday_data_version()
+        return records
+
+    def write(self, vals):
+        regions = self.region_id
+        refresh = self._affects_occurrences(vals)
+        res = super().write(vals)
+        if refresh:
+            self.env['calendar.holiday.occurrence']._refresh_regions(regions | self.region_id)
+            self._invalidate_holiday_data_version()
+        return res
+
+    def unlink(self):
+        regions = self.region_id
+        res = super().unlink()
+        self.env['calendar.holiday.occurrence']._refresh_regions(regions)
+        self._invalidate_holiday_data_version()
+        return res
+
+    def _affects_occurrences(self, vals):
+        """Indique si la modification change les occurrences matérialisées
+
+        Le mois et le jour n'importent que pour les dates fixes : la mise à
+        jour annuelle des dates variables ne régénère rien.
+        """
+        if set(vals) & {'name', 'region_id', 'type', 'variable_type', 'active'}:
+            return True
+        if set(vals) & {'month', 'day'}:
+            return any(holiday.type == 'fixed' for holiday in self)
+        return False
+
     @api.constrains('month', 'day')
     def _check_date(self):
         for record in self:
@@ -90,29 +127,29 @@ class CalendarHoliday(models.Model):
             else:
                 holiday.weekday = False
 
-    def _compute_variable_date(self, year):
-        """Calcule la date en fonction du type de date variable"""
-        self.ensure_one()
-        if not self.variable_type:
-            return False
+    @api.model
+    def _get_variable_dates(self, year, region_code=None):
+        """Dates de chaque type de date variable pour une année et une région
 
-        easter_date = easter(year)
-
-        date_mapping = {
-            'easter': easter_date,
-            'good_friday': easter_date - timedelta(days=2),
-            'easter_monday': easter_date + timedelta(days=1),
-            'ascension': easter_date + timedelta(days=39),
-            'pentecost': easter_date + timedelta(days=49),
-            'pentecost_monday': easter_date + timedelta(days=50),
-            'assumption': datetime(year, 8, 15),
-            'all_saints': datetime(year, 11, 1),
-            'armistice': datetime(year, 11, 11),
-            'christmas': datetime(year, 12, 25),
-            'new_year': datetime(year, 1, 1),
-            'labor_day': datetime(year, 5, 1),
-            'victory_1945': datetime(year, 5, 8),
-            'bastille': datetime(year, 7, 14),
+        Returns:
+            dict: {variable_type: date}
+        """
+        easter = easter_date(year)
+        dates = {
+            'easter': easter,
+            'good_friday': easter - timedelta(days=2),
+            'easter_monday': easter + timedelta(days=1),
+            'ascension': easter + timedelta(days=39),
+            'pentecost': easter + timedelta(days=49),
+            'pentecost_monday': easter + timedelta(days=50),
+            'assumption': date(year, 8, 15),
+            'all_saints': date(year, 11, 1),
+            'armistice': date(year, 11, 11),
+            'christmas': date(year, 12, 25),
+            'new_year': date(year, 1, 1),
+            'labor_day': date(year, 5, 1),
+            'victory_1945': date(year, 5, 8),
+            'bastille': date(year, 7, 14),
         }
 
         # Dates spécifiques par région pour l'abolition de l'esclavage
@@ -123,12 +160,82 @@ class CalendarHoliday(models.Model):
             'RE': (12, 20), # Réunion
             'YT': (4, 27),  # Mayotte
         }
+        if region_code in abolition_dates:
+            dates['abolition'] = date(year, *abolition_dates[region_code])
+        return dates
 
-        if self.variable_type == 'abolition' and self.region_id.code in abolition_dates:
-            month, day = abolition_dates[self.region_id.code]
-            return datetime(year, month, day)
+    def _compute_variable_date(self, year):
+        """Calcule la date en fonction du type de date variable"""
+        self.ensure_one()
+        if not self.variable_type:
+            return False
+        return self._get_variable_dates(year, self.region_id.code).get(self.variable_type, False)
 
-        return date_mapping.get(self.variable_type, False)
+    def _get_date_for_year(self, year):
+        """Date du jour férié pour une année donnée, ou False"""
+        self.ensure_one()
+        if self.type == 'variable':
+            holiday_date = self._compute_variable_date(year)
+            return holiday_date.date() if isinstance(holiday_date, datetime) else holiday_date
+        try:
+            return date(year, self.month, self.day)
+        except (TypeError, ValueError):
+            return False
+
+    @api.model
+    def _get_holiday_data_version(self):
+        """Empreinte des règles de jours fériés et des régions
+
+        Sert de version aux calendriers précalculés et aux exports : elle
+        couvre toutes les colonnes dont dépendent les dates et les libellés
+        mis en cache. L'empreinte est gardée par le processus tant que le
+        nombre de lignes et la dernière date de modification des deux tables
+        sont inchangés : les autres workers voient ainsi les modifications
+        validées sans invalidation du cache du registre.
+        """
+        self.flush_model()
+        self.env['calendar.region'].flush_model()
+        self.env.cr.execute("""
+            SELECT (SELECT concat(count(*), ',', max(write_date)) FROM calendar_holiday),
+                   (SELECT concat(count(*), ',', max(write_date)) FROM calendar_region)
+        """)
+        stamp = self.env.cr.fetchone()
+        cached = _data_versions.get(self.env.cr.dbname)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        self.env.cr.execute("""
+            SELECT md5(concat(
+                (SELECT string_agg(concat_ws(',', id, region_id, type, variable_type, month, day, active, md5(name::text)), ';' ORDER BY id)
+                 FROM calendar_holiday),
+                '|',
+                (SELECT string_agg(concat_ws(',', id, code, country_id, active), ';' ORDER BY id)
+                 FROM calendar_region)
+            ))
+        """)
+        version = self.env.cr.fetchone()[0]
+        _data_versions[self.env.cr.dbname] = (stamp, version)
+        return version
+
+    @api.model
+    def _get_holiday_data_date(self):
+        """Date de dernière modification des jours fériés et des régions"""
+        self.flush_model(['write_date'])
+        self.env['calendar.region'].flush_model(['write_date'])
+        self.env.cr.execute("""
+            SELECT greatest((SELECT max(write_date) FROM calendar_holiday),
+                            (SELECT max(write_date) FROM calendar_region))
+        """)
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _invalidate_holiday_data_version(self):
+        """Oublie la version connue du processus
+
+        Deux modifications d'une même transaction partagent leur date de
+        modification : la version est recalculée à la prochaine lecture.
+        """
+        _data_versions.pop(self.env.cr.dbname, None)
 
     def action_compute_dates(self):
         """Action appelée depuis le bouton dans l'interface"""
@@ -146,40 +253,68 @@ class CalendarHoliday(models.Model):
         }
 
     @api.model
-    def compute_variable_dates(self, year=None):
-        """Calcule les dates variables pour une année donnée"""
+    def _get_region_calendar(self, region_code):
+        """Calendrier national utilisé pour une région"""
+        if region_code in ALSACE_MOSELLE_CODES:
+            return AlsaceMoselleHolidays()
+        return FrenchHolidays()
+
+    @api.model
+    def compute_variable_dates(self, year=None, last_year=None):
+        """Calcule et enregistre les dates variables pour une année ou une plage d'années"""
+        self._compute_variable_dates(year, last_year)
+        return True
+
+    @api.model
+    def _compute_variable_dates(self, year=None, last_year=None):
+        """Calcule les dates variables pour une année ou une plage d'années
+
+        Les dates sont calculées une seule fois par région et par année, en
+        s'appuyant sur ``variable_type`` ; les jours fériés sans type sont
+        rapprochés par nom des jours fériés du calendrier de leur région.
+        Seules les dates de ``year`` sont enregistrées, par écritures
+        groupées et sans suivi.
+
+        Returns:
+            dict: {holiday_id: {année: date}} pour toute la plage
+        """
         if not year:
             year = fields.Date.today().year
+        last_year = max(last_year or year, year)
 
-        # Dictionnaire des calendriers par région
-        calendars = {
-            'GP': France(),  # Guadeloupe
-            'MQ': France(),  # Martinique
-            'GF': France(),  # Guyane
-            'RE': France(),  # Réunion
-            'YT': France(),  # Mayotte
-            '67': AlsaceMoselleCalendar(),  # Bas-Rhin
-            '68': AlsaceMoselleCalendar(),  # Haut-Rhin
-            '57': AlsaceMoselleCalendar(),  # Moselle
-            'FR': France(),  # France métropolitaine (par défaut)
-        }
-
-        # Pour chaque région, on calcule ses jours fériés
-        for holiday in self.search([('type', '=', 'variable')]):
+        holidays = self.search([('type', '=', 'variable')])
+        variable_dates = {}  # (code région, année) -> {variable_type: date}
+        calendar_dates = {}  # (calendrier, année) -> [(date, nom)]
+        results = defaultdict(dict)
+        for holiday in holidays:
             region_code = holiday.region_id.code
-            calendar = calendars.get(region_code, calendars['FR'])
-            
-            # Récupère les jours fériés pour cette région
-            holidays = calendar.holidays(year)
-            
-            # Cherche la correspondance par nom
-            for date, name in holidays:
-                if name.lower() in holiday.name.lower():
-                    holiday.write({
-                        'date': date,
-                        'month': date.month,
-                        'day': date.day
-                    })
-                    break
-
-        return True
\ No newline at end of file
+            for current_year in range(year, last_year + 1):
+                if holiday.variable_type:
+                    key = (region_code, current_year)
+                    if key not in variable_dates:
+                        variable_dates[key] = self._get_variable_dates(current_year, region_code)
+                    holiday_date = variable_dates[key].get(holiday.variable_type)
+                else:
+                    calendar_key = ('alsace_moselle' if region_code in ALSACE_MOSELLE_CODES else 'france', current_year)
+                    if calendar_key not in calendar_dates:
+                        calendar_dates[calendar_key] = self._get_region_calendar(region_code).holidays(current_year)
+                    name = holiday.name.lower()
+                    holiday_date = next((day for day, label in calendar_dates[calendar_key] if label.lower() in name), None)
+                if holiday_date:
+                    results[holiday.id][current_year] = holiday_date
+
+        # Ecritures groupées par date, sans message de suivi
+        to_write = defaultdict(list)
+        for holiday in holidays:
+            holiday_date = results.get(holiday.id, {}).get(year)
+            if holiday_date and holiday.date != holiday_date:
+                to_write[holiday_date].append(holiday.id)
+        quiet = self.with_context(tracking_disable=True, mail_notrack=True)
+        for holiday_date, ids in to_write.items():
+            quiet.browse(ids).write({
+                'date': holiday_date,
+                'month': holiday_date.month,
+                'day': holiday_date.day,
+            })
+
+        return dict(results)
@@ -0,0 +1,142 @@
+from odoo import models, fields, api, tools
+from datetime import date
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class CalendarHolidayOccurrence(models.Model):
+    """Occurrences datées des jours fériés, matérialisées sur un horizon
+
+    Une ligne par calendrier (pays, région éventuelle) et par jour férié,
+    générée à partir du calendrier national et des règles ``calendar.holiday``.
+    La table est régénérée par région quand les règles changent et
+    l'horizon est avancé chaque jour par un cron.
+    """
+    _name = 'calendar.holiday.occurrence'
+    _description = 'Occurrence de jour férié'
+    _order = 'date, country_id, region_id'
+
+    name = fields.Char(string='Nom', required=True, readonly=True)
+    date = fields.Date(string='Date', required=True, readonly=True, index=True)
+    country_id = fields.Many2one(comodel_name='res.country', string='Pays', required=True, readonly=True, ondelete='cascade')
+    region_id = fields.Many2one(comodel_name='calendar.region', string='Région', readonly=True, ondelete='cascade')
+    holiday_id = fields.Many2one(comodel_name='calendar.holiday', string='Règle', readonly=True, index=True, ondelete='cascade',
+                                 help="Règle de jour férié à l'origine de l'occurrence (vide pour les jours fériés nationaux)")
+
+    def init(self):
+        tools.create_index(self._cr, 'calendar_holiday_occurrence_region_date_idx', self._table, ['region_id', 'date'])
+        tools.create_index(self._cr, 'calendar_holiday_occurrence_country_date_idx', self._table, ['country_id', 'region_id', 'date'])
+
+    @api.model
+    def _get_horizon(self):
+        """Années matérialisées : (première, dernière)"""
+        params = self.env['ir.config_parameter'].sudo()
+        year = fields.Date.context_today(self).year
+        past = int(params.get_param('waf_tempo.holiday_horizon_past_years', 1))
+        future = int(params.get_param('waf_tempo.holiday_horizon_years', 10))
+        return year - past, year + future
+
+    @api.model
+    def _get_country_codes(self):
+        """Pays matérialisés sans région (``waf_tempo.holiday_occurrence_countries``)"""
+        value = self.env['ir.config_parameter'].sudo().get_param('waf_tempo.holiday_occurrence_countries', 'FR')
+        return {code.strip().upper() for code in value.split(',') if code.strip()}
+
+    @api.model
+    def _get_year_holidays(self, country, region, year):
+        """Jours fériés matérialisés d'un calendrier pour une année
+
+        Returns:
+            dict: {date: nom}, ou None si le calendrier ou l'année n'est pas matérialisé
+        """
+        first_year, last_year = self._get_horizon()
+        if not first_year <= year <= last_year:
+            return None
+        if not region and country.code not in self._get_country_codes():
+            return None
+
+        self.env.cr.execute("""
+            SELECT date, name FROM calendar_holiday_occurrence
+            WHERE country_id = %s AND region_id IS NOT DISTINCT FROM %s
+              AND date BETWEEN %s AND %s
+        """, (country.id, region.id or None, date(year, 1, 1), date(year, 12, 31)))
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _generate(self, calendars, first_year, last_year):
+        """Régénère les occurrences des calendriers [(pays, région)] sur la plage d'années
+
+        Les occurrences existantes des calendriers sont supprimées ; celles
+        des régions archivées ne sont pas recréées.
+
+        Returns:
+            int: Nombre d'occurrences insérées
+        """
+        mixin = self.env['business.day.mixin']
+        rows = []
+        for country, region in calendars:
+            if region and not region.active:
+                continue
+            rules = region.specific_holiday_ids if region else self.env['calendar.holiday']
+            for year in range(first_year, last_year + 1):
+                rule_ids = {}
+                for rule in rules:
+                    rule_date = rule._get_date_for_year(year)
+                    if rule_date:
+                        rule_ids[rule_date] = rule.id
+                for day, name in mixin._compute_year_holidays(country, region, year).items():
+                    rows.append((country.id, region.id or None, day, name, rule_ids.get(day)))
+
+        region_ids = [region.id for _country, region in calendars if region]
+        country_ids = [country.id for country, region in calendars if not region]
+        self.env.cr.execute("""
+            DELETE FROM calendar_holiday_occurrence
+            WHERE date BETWEEN %s AND %s
+              AND (region_id = ANY(%s) OR (region_id IS NULL AND country_id = ANY(%s)))
+        """, (date(first_year, 1, 1), date(last_year, 12, 31), region_ids, country_ids))
+
+        if rows:
+            country_col, region_col, date_col, name_col, holiday_col = zip(*rows)
+            self.env.cr.execute("""
+                INSERT INTO calendar_holiday_occurrence
+                    (country_id, region_id, date, name, holiday_id, create_uid, create_date, write_uid, write_date)
+                SELECT country_id, region_id, date, name, holiday_id,
+                       %(uid)s, now() AT TIME ZONE 'UTC', %(uid)s, now() AT TIME ZONE 'UTC'
+                FROM unnest(%(countries)s::int[], %(regions)s::int[], %(dates)s::date[], %(names)s::varchar[], %(holidays)s::int[])
+                    AS t(country_id, region_id, date, name, holiday_id)
+            """, {
+                'uid': self.env.uid,
+                'countries': list(country_col),
+                'regions': list(region_col),
+                'dates': list(date_col),
+                'names': list(name_col),
+                'holidays': list(holiday_col),
+            })
+        self.invalidate_model()
+        return len(rows)
+
+    @api.model
+    def _refresh_regions(self, regions):
+        """Régénère les occurrences des régions sur l'horizon (après modification des règles)"""
+        regions = regions.sudo().with_context(active_test=False).exists()
+        if not regions:
+            return 0
+        first_year, last_year = self._get_horizon()
+        calendars = [(region.country_id, region) for region in regions]
+        return self.sudo()._generate(calendars, first_year, last_year)
+
+    @api.model
+    def _cron_generate_occurrences(self):
+        """Cron : régénère toutes les occurrences sur l'horizon glissant"""
+        first_year, last_year = self._get_horizon()
+        countries = self.env['res.country'].search([('code', 'in', list(self._get_country_codes()))])
+        calendars = [(country, self.env['calendar.region']) for country in countries]
+        calendars += [(region.country_id, region) for region in self.env['calendar.region'].sudo().search([])]
+
+        self.env.cr.execute("DELETE FROM calendar_holiday_occurrence WHERE date < %s OR date > %s",
+                            (date(first_year, 1, 1), date(last_year, 12, 31)))
+        count = self.sudo()._generate(calendars, first_year, last_year)
+        self.env.registry.clear_cache()
+        _logger.info(f"Jours fériés : {count} occurrences générées de {first_year} à {last_year}")
+        return count
@@ -20,6 +20,25 @@ class CalendarRegion(models.Model):
         ('unique_country_code', 'unique(country_id, code)', 'Une seule région par code et pays !')
     ]
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['calendar.holiday.occurrence']._refresh_regions(records)
+        self.env['calendar.holiday']._invalidate_holiday_data_version()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if set(vals) & {'code', 'country_id', 'active'}:
+            self.env['calendar.holiday.occurrence']._refresh_regions(self)
+            self.env['calendar.holiday']._invalidate_holiday_data_version()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env['calendar.holiday']._invalidate_holiday_data_version()
+        return res
+
     @api.constrains('code')
     def _check_code(self):
         for record in self:
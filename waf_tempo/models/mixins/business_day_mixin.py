@@ -1,7 +1,13 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError, UserError
-from workalendar.registry import registry
+from collections import defaultdict
 from datetime import date, timedelta
+from ...tools.french_holidays import get_calendar
+from ...tools.holiday_cache import CalendarHolidays, LRUCache
+
+# Jours fériés précalculés par (base, pays, région, version des données)
+_calendar_cache = LRUCache(max_entries=64)
+
 
 class BusinessDayMixin(models.AbstractModel):
     """
@@ -16,59 +22,19 @@ class BusinessDayMixin(models.AbstractModel):
     calendar_region_id = fields.Many2one(compute='_compute_calendar_region_id', store=True, string="Région du calendrier", help="Région du calendrier")
     business_days_count = fields.Integer(compute='_compute_business_days', store=True, string="Nombre de jours ouvrés", help="Nombre de jours ouvrés dans la période")
     
-    _calendar_instances = {}  # Cache pour les instances de calendrier
-
     def _get_calendar_key(self):
         """Génère une clé unique pour le cache du calendrier"""
         return f"{self.calendar_country.code}_{self.calendar_region_id.code or 'none'}"
 
     def _get_calendar_instance(self):
-        """Récupération optimisée du calendrier avec cache"""
+        """Calendrier national du pays (partagé, sans les jours fériés régionaux)"""
         self.ensure_one()
-        cache_key = self._get_calendar_key()
-        
-        if cache_key not in self._calendar_instances:
-            calendar = self._create_calendar_instance()
-            self._calendar_instances[cache_key] = calendar
-            
-        return self._calendar_instances[cache_key]
+        return get_calendar(self.calendar_country.code)
 
-    def _create_calendar_instance(self):
-        """Création d'une nouvelle instance de calendrier"""
-        country_code = self.calendar_country.code.lower()
-        calendar_class = registry.get(country_code) or registry.get('france')
-        calendar = calendar_class()
-        
-        if self.calendar_region_id:
-            self._add_regional_holidays(calendar)
-            
-        return calendar
-
-    def _add_regional_holidays(self, calendar):
-        """Ajoute les jours fériés régionaux au calendrier"""
-        if not self.calendar_region_id:
-            return calendar
-
-        original_holidays = calendar.holidays
-        regional_holidays = self._get_regional_holidays()
-
-        def extended_holidays(year):
-            holidays = dict(original_holidays(year))
-            for mmdd, name in regional_holidays.items():
-                month, day = map(int, mmdd.split('-'))
-                try:
-                    holiday_date = date(year, month, day)
-                    holidays[holiday_date] = name
-                except ValueError:
-                    continue
-            return sorted(holidays.items())
-
-        calendar.holidays = extended_holidays
-        return calendar
-
-    def _get_regional_holidays(self):
+    def _get_regional_holidays(self, region=None):
         """Retourne les jours fériés spécifiques à la région"""
-        if not self.calendar_region_id:
+        region = region or self.calendar_region_id
+        if not region:
             return {}
 
         return {
@@ -85,34 +51,134 @@ class BusinessDayMixin(models.AbstractModel):
             'RE': {
                 '12-20': "Abolition de l'esclavage (Réunion)",
             },
-        }.get(self.calendar_region_id.code, {})
+        }.get(region.code, {})
+
+    @api.model
+    def _load_year_holidays(self, country, region, year):
+        """Jours fériés d'une année, lus dans la table des occurrences lorsqu'elle couvre l'année
+
+        Returns:
+            dict: {date: nom}
+        """
+        holidays = self.env['calendar.holiday.occurrence'].sudo()._get_year_holidays(country, region, year)
+        if holidays is None:
+            holidays = self._compute_year_holidays(country, region, year)
+        return holidays
+
+    @api.model
+    def _compute_year_holidays(self, country, region, year):
+        """Jours fériés d'une année : calendrier national, jours régionaux et règles ``calendar.holiday``
+
+        Returns:
+            dict: {date: nom}
+        """
+        holidays = dict(get_calendar(country.code).holidays(year))
+        if not region:
+            return holidays
+
+        for mmdd, name in self._get_regional_holidays(region).items():
+            month, day = map(int, mmdd.split('-'))
+            try:
+                holidays[date(year, month, day)] = name
+            except ValueError:
+                continue
+
+        rules = self.env['calendar.holiday'].sudo().search([('region_id', '=', region.id)])
+        for rule in rules:
+            holiday_date = rule._get_date_for_year(year)
+            if holiday_date:
+                holidays[holiday_date] = rule.name
+        return holidays
+
+    @api.model
+    def _get_calendar_holidays(self, country, region):
+        """Jours fériés précalculés du calendrier (pays, région)
+
+        L'entrée est partagée par le processus et indexée par la base, le
+        calendrier et la version des données de jours fériés : une
+        modification des jours fériés ou des régions change la version.
+        """
+        key = (
+            self.env.cr.dbname,
+            country.code,
+            region.code or None,
+            self.env['calendar.holiday']._get_holiday_data_version(),
+        )
+        entry = _calendar_cache.get(key)
+        if entry is None:
+            weekend_days = get_calendar(country.code).get_weekend_days()
+            entry = _calendar_cache.setdefault(key, CalendarHolidays(weekend_days))
+        return entry
+
+    @api.model
+    def _get_holiday_index_for(self, country, region, first_year, last_year=None):
+        """Index des jours ouvrés du calendrier (pays, région) couvrant les années demandées"""
+        return self._get_calendar_holidays(country, region).index(
+            first_year, last_year or first_year,
+            lambda year: self._load_year_holidays(country, region, year)
+        )
+
+    @api.model
+    def _get_holidays_for(self, country, region, year):
+        """Jours fériés {date: nom} du calendrier (pays, région) pour une année"""
+        return self._get_calendar_holidays(country, region).holidays(
+            year, lambda year: self._load_year_holidays(country, region, year)
+        )
+
+    def _get_holiday_index(self, first_year, last_year=None):
+        """Index des jours ouvrés du calendrier de l'enregistrement"""
+        self.ensure_one()
+        return self._get_holiday_index_for(self.calendar_country, self.calendar_region_id, first_year, last_year)
+
+    @api.model
+    def business_days_count_many(self, country, region, starts, ends):
+        """Nombres de jours ouvrés de ``]start, end]`` pour des listes de dates, en une passe
+
+        Args:
+            country: Pays du calendrier (res.country)
+            region: Région du calendrier (calendar.region, éventuellement vide)
+            starts: Dates de début
+            ends: Dates de fin, de même longueur
+
+        Returns:
+            list: Nombre de jours ouvrés de chaque période
+        """
+        if not starts:
+            return []
+        first_year = min(min(starts), min(ends)).year
+        last_year = max(max(starts), max(ends)).year
+        index = self._get_holiday_index_for(country, region, first_year, last_year)
+        return index.working_days_delta_many(starts, ends)
 
     @api.depends('date_start', 'date_end', 'calendar_country', 'calendar_region_id')
     def _compute_business_days(self):
+        groups = defaultdict(list)
         for record in self:
-            if not (record.date_start and record.date_end):
+            if record.date_start and record.date_end:
+                groups[(record.calendar_country, record.calendar_region_id)].append(record)
+            else:
                 record.business_days_count = 0
-                continue
 
+        for (country, region), records in groups.items():
             try:
-                calendar = record._get_calendar_instance()
-                record.business_days_count = calendar.get_working_days_delta(
-                    record.date_start,
-                    record.date_end
+                counts = self.business_days_count_many(
+                    country, region,
+                    [record.date_start for record in records],
+                    [record.date_end for record in records],
                 )
             except Exception:
-                record.business_days_count = 0
+                counts = [0] * len(records)
+            for record, count in zip(records, counts):
+                record.business_days_count = count
 
     def is_business_day(self, check_date):
         """Vérifie si une date est un jour ouvré"""
         self.ensure_one()
-        return self._get_calendar_instance().is_working_day(check_date)
+        return self._get_holiday_index(check_date.year).is_working_day(check_date)
 
     def get_business_days_info(self):
         """Retourne les informations détaillées sur les jours ouvrés"""
         self.ensure_one()
-        calendar = self._get_calendar_instance()
-        
         if not (self.date_start and self.date_end):
             return {}
 
@@ -120,9 +186,9 @@ class BusinessDayMixin(models.AbstractModel):
         period_info = self._get_period_info(self.date_start, self.date_end)
         
         # Récupération des jours fériés
-        holidays = dict(calendar.holidays(self.date_start.year))
-        if self.date_start.year != self.date_end.year:
-            holidays.update(dict(calendar.holidays(self.date_end.year)))
+        holidays = {}
+        for year in range(self.date_start.year, self.date_end.year + 1):
+            holidays.update(self._get_holidays_for(self.calendar_country, self.calendar_region_id, year))
 
         return {
             **period_info,
@@ -142,14 +208,17 @@ class BusinessDayMixin(models.AbstractModel):
         if not self.date_end:
             self.date_end = self.date_start
 
-        calendar = self._get_calendar_instance()
-        self.date_end = calendar.add_working_days(self.date_end, days_count)
+        # Au moins 200 jours ouvrés par an : l'index couvre toujours la date cherchée
+        span = abs(days_count) // 200 + 1
+        index = self._get_holiday_index(self.date_end.year - span, self.date_end.year + span)
+        self.date_end = index.add_working_days(self.date_end, days_count)
         return True
 
     @api.model
     def clear_calendar_cache(self):
-        """Vide le cache des instances de calendrier"""
-        self._calendar_instances.clear()
+        """Vide le cache des jours fériés précalculés, dans tous les workers"""
+        _calendar_cache.clear()
+        self.env.registry.clear_cache()
 
     @api.depends('calendar_country')
     def _compute_calendar_region_id(self):
@@ -2,6 +2,9 @@ from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError, UserError
 from dateutil.relativedelta import relativedelta
 from datetime import date, timedelta
+import logging
+
+_logger = logging.getLogger(__name__)
 
 class DateRangeMixin(models.AbstractModel):
     """
@@ -94,6 +97,50 @@ class DateRangeMixin(models.AbstractModel):
         
         return ['!'] + domain if operator == '!=' else domain
 
+    @api.model
+    def _cron_rollover_active_periods(self):
+        """Cron : met à jour ``is_active_period`` au changement de jour
+
+        Pour chaque modèle héritant du mixin, seules les périodes qui ont
+        commencé ou se sont terminées depuis le dernier passage sont
+        modifiées, en SQL sur les colonnes indexées ``date_start`` et
+        ``date_end``. Sans passage précédent, toute la table est vérifiée.
+
+        Returns:
+            int: Nombre de périodes modifiées
+        """
+        params = self.env['ir.config_parameter'].sudo()
+        today = fields.Date.context_today(self)
+        last_run = fields.Date.to_date(params.get_param('waf_tempo.period_rollover_date'))
+        if last_run and last_run > today:
+            last_run = False
+
+        active = "(date_start <= %(today)s AND (date_end IS NULL OR date_end >= %(today)s))"
+        changed = "TRUE"
+        if last_run:
+            changed = """((date_start > %(last_run)s AND date_start <= %(today)s)
+                        OR (date_end >= %(last_run)s AND date_end < %(today)s))"""
+
+        total = 0
+        for model_name in self.env.registry.descendants(['date.range.mixin'], '_inherit'):
+            model = self.env[model_name]
+            field = model._fields.get('is_active_period')
+            if model._abstract or not model._auto or not (field and field.store):
+                continue
+            self.env.flush_all()
+            self.env.cr.execute(f"""
+                UPDATE "{model._table}" SET is_active_period = {active}
+                WHERE {changed} AND is_active_period IS DISTINCT FROM {active}
+            """, {'today': today, 'last_run': last_run})
+            count = self.env.cr.rowcount
+            if count:
+                model.invalidate_model(['is_active_period'])
+                _logger.info(f"Périodes actives : {count} enregistrements {model_name} mis à jour")
+            total += count
+
+        params.set_param('waf_tempo.period_rollover_date', fields.Date.to_string(today))
+        return total
+
     def _validate_dates(self, start_date, end_date=None):
         """Validation centralisée des dates"""
         if end_date and start_date > end_date:
@@ -0,0 +1 @@
+from . import test_business_day_benchmark
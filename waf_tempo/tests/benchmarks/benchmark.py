@@ -0,0 +1,98 @@
+"""Outils communs aux benchmarks de waf_tempo (sans dépendance à Odoo)
+
+Les temps mesurés sont comparés aux références de ``baselines.json`` :
+une mesure plus lente que ``référence × seuil`` est une régression. Les
+références sont enregistrées par backend de calcul (``numpy`` lorsque
+NumPy est installé, ``pure`` sinon) ; une mesure sans référence pour le
+backend courant n'est pas comparée.
+
+Variables d'environnement :
+- ``WAF_TEMPO_BENCH_THRESHOLD`` : seuil de régression (2.0 par défaut)
+- ``WAF_TEMPO_BENCH_RECORD=1`` : enregistre les mesures comme nouvelles références
+"""
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+import json
+import os
+import random
+import time
+
+try:
+    import numpy  # noqa: F401
+    BACKEND = 'numpy'
+except ImportError:
+    BACKEND = 'pure'
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+SIZES = (1000, 10000, 100000)
+
+
+def synthetic_ranges(count: int, first_year: int = 2024, years: int = 5, max_days: int = 400,
+                     seed: int = 42) -> Tuple[List[date], List[date]]:
+    """Périodes aléatoires mais reproductibles : (dates de début, dates de fin)"""
+    rng = random.Random(seed)
+    origin = date(first_year, 1, 1)
+    span = years * 365 - max_days
+    starts = [origin + timedelta(days=rng.randrange(span)) for _ in range(count)]
+    ends = [start + timedelta(days=rng.randrange(max_days)) for start in starts]
+    return starts, ends
+
+
+class BenchmarkRecorder:
+    """Mesure des temps d'exécution et comparaison aux références"""
+
+    # En dessous de cette durée, les écarts relèvent du bruit de mesure
+    MIN_SECONDS = 0.02
+
+    def __init__(self, path: str = BASELINES_PATH, threshold: Optional[float] = None, record: Optional[bool] = None,
+                 backend: str = BACKEND):
+        self.path = path
+        self.threshold = threshold or float(os.environ.get('WAF_TEMPO_BENCH_THRESHOLD', 2.0))
+        self.record = record if record is not None else os.environ.get('WAF_TEMPO_BENCH_RECORD') == '1'
+        self.backend = backend
+        self.all_baselines = {}  # backend -> {nom: secondes}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as handle:
+                self.all_baselines = json.load(handle)
+        self.baselines = self.all_baselines.setdefault(backend, {})
+        self.results = {}
+
+    def measure(self, name: str, func: Callable[[], object], repeat: int = 5) -> float:
+        """Meilleur temps (secondes) sur ``repeat`` exécutions"""
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        self.results[name] = best
+        return best
+
+    def regressions(self) -> Dict[str, Tuple[float, float]]:
+        """Mesures dépassant le seuil : {nom: (mesure, référence)}"""
+        if self.record:
+            return {}
+        return {
+            name: (elapsed, self.baselines[name])
+            for name, elapsed in self.results.items()
+            if name in self.baselines
+            and elapsed > self.MIN_SECONDS
+            and elapsed > self.baselines[name] * self.threshold
+        }
+
+    def save(self) -> None:
+        """Enregistre les mesures comme références (mode enregistrement uniquement)"""
+        if not self.record:
+            return
+        self.baselines.update({name: round(elapsed, 6) for name, elapsed in self.results.items()})
+        with open(self.path, 'w', encoding='utf-8') as handle:
+            json.dump(self.all_baselines, handle, indent=4, sort_keys=True)
+            handle.write('\n')
+
+    def report(self) -> str:
+        lines = []
+        for name, elapsed in sorted(self.results.items()):
+            baseline = self.baselines.get(name)
+            suffix = f" (référence {self.backend} {baseline * 1000:.2f} ms)" if baseline else ''
+            lines.append(f"{name}: {elapsed * 1000:.2f} ms{suffix}")
+        return '\n'.join(lines)
@@ -0,0 +1,36 @@
+"""Exécution des benchmarks des outils de waf_tempo, hors serveur Odoo :
+
+    python -m pytest waf_tempo/tests/benchmarks
+
+Le répertoire est un sous-paquet des tests du module (partagé avec les
+benchmarks ORM) : pytest importe le module parent, Odoo doit donc être
+importable. Les outils mesurés, eux, n'en dépendent pas.
+"""
+import os
+import sys
+
+import pytest
+
+# Le paquet ``tools`` du module s'importe sans Odoo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark import BenchmarkRecorder  # noqa: E402
+
+
+recorder_key = pytest.StashKey[BenchmarkRecorder]()
+
+
+@pytest.fixture(scope='session')
+def recorder(request):
+    recorder = BenchmarkRecorder()
+    request.config.stash[recorder_key] = recorder
+    yield recorder
+    recorder.save()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    recorder = config.stash.get(recorder_key, None)
+    if recorder and recorder.results:
+        terminalreporter.write_sep('-', f'benchmarks ({recorder.backend})')
+        terminalreporter.write_line(recorder.report())
@@ -0,0 +1,55 @@
+from datetime import date
+
+import pytest
+
+from benchmark import SIZES, synthetic_ranges
+from tools.french_holidays import AlsaceMoselleHolidays, FrenchHolidays
+from tools.holiday_cache import CalendarHolidays
+
+FIRST_YEAR, LAST_YEAR = 2024, 2028
+
+# Calendriers de référence : métropole, Alsace-Moselle et un DOM (Guadeloupe)
+CALENDARS = {
+    'metropole': (FrenchHolidays(), {}),
+    'alsace_moselle': (AlsaceMoselleHolidays(), {}),
+    'dom_gp': (FrenchHolidays(), {(5, 27): "Abolition de l'esclavage", (7, 21): "Fête Victor Schœlcher"}),
+}
+
+
+def load_year(calendar, regional, year):
+    holidays = dict(calendar.holidays(year))
+    holidays.update({date(year, month, day): name for (month, day), name in regional.items()})
+    return holidays
+
+
+def build_index(name):
+    calendar, regional = CALENDARS[name]
+    entry = CalendarHolidays(calendar.get_weekend_days())
+    return entry.index(FIRST_YEAR, LAST_YEAR, lambda year: load_year(calendar, regional, year))
+
+
+@pytest.mark.parametrize('name', sorted(CALENDARS))
+def test_build_index(recorder, name):
+    recorder.measure(f'tools.build_index.{name}', lambda: build_index(name))
+    assert f'tools.build_index.{name}' not in recorder.regressions(), recorder.report()
+
+
+@pytest.mark.parametrize('size', SIZES)
+@pytest.mark.parametrize('name', sorted(CALENDARS))
+def test_business_days_count(recorder, name, size):
+    index = build_index(name)
+    starts, ends = synthetic_ranges(size, FIRST_YEAR)
+    key = f'tools.business_days_count.{name}.{size}'
+    recorder.measure(key, lambda: index.working_days_delta_many(starts, ends))
+    assert key not in recorder.regressions(), recorder.report()
+
+
+@pytest.mark.parametrize('size', SIZES)
+@pytest.mark.parametrize('name', sorted(CALENDARS))
+def test_add_business_days(recorder, name, size):
+    index = build_index(name)
+    starts, ends = synthetic_ranges(size, FIRST_YEAR)
+    deltas = [(end - start).days // 2 for start, end in zip(starts, ends)]
+    key = f'tools.add_business_days.{name}.{size}'
+    recorder.measure(key, lambda: [index.add_working_days(start, delta) for start, delta in zip(starts, deltas)])
+    assert key not in recorder.regressions(), recorder.report()
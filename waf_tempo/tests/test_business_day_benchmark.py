@@ -0,0 +1,98 @@
+from odoo.tests import TransactionCase, tagged
+from .benchmarks.benchmark import SIZES, BenchmarkRecorder, synthetic_ranges
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+@tagged('post_install', '-at_install', '-standard', 'waf_tempo_benchmark')
+class TestBusinessDayBenchmark(TransactionCase):
+    """Benchmarks des calculs de jours ouvrés
+
+    Exclus des tests standard ; à lancer avec
+    ``--test-tags waf_tempo_benchmark``. Comme les benchmarks des outils,
+    les mesures sont comparées aux références de ``baselines.json`` (seuil
+    ``WAF_TEMPO_BENCH_THRESHOLD``) et enregistrées avec
+    ``WAF_TEMPO_BENCH_RECORD=1``.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.recorder = BenchmarkRecorder()
+        france = cls.env.ref('base.fr')
+        alsace = cls.env['calendar.region'].search([('code', '=', '67')], limit=1) or cls.env['calendar.region'].create({
+            'name': 'Bas-Rhin',
+            'code': '67',
+            'country_id': france.id,
+        })
+        cls.env['calendar.holiday'].create([{
+            'name': 'Vendredi saint',
+            'region_id': alsace.id,
+            'type': 'variable',
+            'variable_type': 'good_friday',
+            'date': '2024-03-29',
+        }, {
+            'name': 'Saint-Étienne',
+            'region_id': alsace.id,
+            'type': 'fixed',
+            'month': 12,
+            'day': 26,
+            'date': '2024-12-26',
+        }])
+        cls.calendars = {
+            'metropole': (france, cls.env['calendar.region']),
+            'alsace_moselle': (france, alsace),
+            'dom_gp': (cls.env.ref('base.gp'), cls.env.ref('waf_tempo.region_gp')),
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.recorder.save()
+        _logger.info("Benchmarks waf_tempo (%s) :\n%s", cls.recorder.backend, cls.recorder.report())
+        super().tearDownClass()
+
+    def _measure(self, key, func):
+        self.recorder.measure(key, func)
+        self.assertNotIn(key, self.recorder.regressions(), self.recorder.report())
+
+    def _make_records(self, country, region, size):
+        starts, ends = synthetic_ranges(size)
+        Mixin = self.env['business.day.mixin']
+        return Mixin.concat(*(
+            Mixin.new({
+                'calendar_country': country.id,
+                'calendar_region_id': region.id,
+                'date_start': start,
+                'date_end': end,
+                'period_type': 'custom',
+            })
+            for start, end in zip(starts, ends)
+        ))
+
+    def test_business_days_count_many(self):
+        Mixin = self.env['business.day.mixin']
+        for name, (country, region) in self.calendars.items():
+            for size in SIZES:
+                starts, ends = synthetic_ranges(size)
+                key = f'odoo.business_days_count_many.{name}.{size}'
+                self._measure(key, lambda: Mixin.business_days_count_many(country, region, starts, ends))
+
+    def test_compute_business_days(self):
+        for name, (country, region) in self.calendars.items():
+            for size in SIZES:
+                records = self._make_records(country, region, size)
+                key = f'odoo.compute_business_days.{name}.{size}'
+                self._measure(key, records._compute_business_days)
+
+    def test_get_business_days_info(self):
+        for name, (country, region) in self.calendars.items():
+            for size in SIZES:
+                records = self._make_records(country, region, size)
+                key = f'odoo.get_business_days_info.{name}.{size}'
+                self._measure(key, lambda: [record.get_business_days_info() for record in records])
+
+    def test_compute_variable_dates(self):
+        Holiday = self.env['calendar.holiday']
+        key = 'odoo.compute_variable_dates.10_years'
+        self._measure(key, lambda: Holiday.compute_variable_dates(2024, 2033))
@@ -0,0 +1,3 @@
+from . import french_holidays
+from . import holiday_index
+from . import holiday_cache
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+from threading import Lock
+from typing import Dict, List, Tuple
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Départements et régions d'outre-mer : calendrier national français
+FRENCH_COUNTRY_CODES = ('FR', 'GP', 'MQ', 'GF', 'RE', 'YT')
+
+
+def easter_date(year: int) -> date:
+    """Dimanche de Pâques du calendrier grégorien (algorithme de Meeus/Jones/Butcher)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+class FrenchHolidays:
+    """Jours fériés nationaux français, sans dépendance externe
+
+    Expose le sous-ensemble de l'interface workalendar utilisé par le
+    module : ``holidays(year)`` et ``get_weekend_days()``.
+    """
+
+    def get_weekend_days(self) -> Tuple[int, ...]:
+        return (5, 6)
+
+    def holidays(self, year: int) -> List[Tuple[date, str]]:
+        easter = easter_date(year)
+        holidays = {
+            date(year, 1, 1): "Jour de l'An",
+            easter + timedelta(days=1): "Lundi de Pâques",
+            date(year, 5, 1): "Fête du Travail",
+            date(year, 5, 8): "Victoire 1945",
+            easter + timedelta(days=39): "Ascension",
+            easter + timedelta(days=50): "Lundi de Pentecôte",
+            date(year, 7, 14): "Fête Nationale",
+            date(year, 8, 15): "Assomption",
+            date(year, 11, 1): "Toussaint",
+            date(year, 11, 11): "Armistice",
+            date(year, 12, 25): "Noël",
+        }
+        holidays.update(self._extra_holidays(year, easter))
+        return sorted(holidays.items())
+
+    def _extra_holidays(self, year: int, easter: date) -> Dict[date, str]:
+        return {}
+
+
+class AlsaceMoselleHolidays(FrenchHolidays):
+    """Jours fériés d'Alsace-Moselle : Vendredi saint et Saint-Étienne en plus"""
+
+    def _extra_holidays(self, year: int, easter: date) -> Dict[date, str]:
+        return {
+            easter - timedelta(days=2): "Vendredi saint",
+            date(year, 12, 26): "Saint-Étienne",
+        }
+
+
+_calendars = {}
+_calendars_lock = Lock()
+
+
+def get_calendar(country_code: str):
+    """Calendrier national partagé d'un pays
+
+    France et outre-mer utilisent le générateur intégré ; les autres pays
+    passent par workalendar, importé au premier usage. Sans workalendar,
+    le calendrier français est utilisé.
+    """
+    country_code = (country_code or 'FR').upper()
+    with _calendars_lock:
+        if country_code not in _calendars:
+            _calendars[country_code] = _create_calendar(country_code)
+        return _calendars[country_code]
+
+
+def _create_calendar(country_code: str):
+    if country_code in FRENCH_COUNTRY_CODES:
+        return FrenchHolidays()
+    try:
+        from workalendar.registry import registry
+    except ImportError:
+        _logger.warning(f"workalendar n'est pas installé : calendrier français utilisé pour {country_code}")
+        return FrenchHolidays()
+    calendar_class = registry.get(country_code)
+    return calendar_class() if calendar_class else FrenchHolidays()
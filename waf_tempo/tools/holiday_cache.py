@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from datetime import date
+from threading import RLock
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+from .holiday_index import HolidayIndex
+
+
+class LRUCache:
+    """Cache LRU borné en nombre d'entrées, partagé entre threads"""
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def setdefault(self, key: Hashable, value: Any) -> Any:
+        """Enregistre la valeur si la clé est absente et retourne la valeur en cache"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CalendarHolidays:
+    """Jours fériés d'un calendrier (pays, région), précalculés par année
+
+    Les années manquantes sont chargées à la demande par la fonction
+    ``load_year(year) -> {date: nom}`` fournie par l'appelant ; l'index des
+    jours ouvrés est reconstruit lorsqu'une requête sort de sa plage.
+    """
+
+    def __init__(self, weekend_days: Iterable[int] = (5, 6)):
+        self.weekend_days = tuple(weekend_days)
+        self._years = {}  # année -> {date: nom}
+        self._index = None
+        self._lock = RLock()
+
+    def _load(self, first_year: int, last_year: int, load_year: Callable[[int], Dict[date, str]]) -> None:
+        for year in range(first_year, last_year + 1):
+            if year not in self._years:
+                self._years[year] = dict(load_year(year))
+
+    def holidays(self, year: int, load_year: Callable[[int], Dict[date, str]]) -> Dict[date, str]:
+        """Jours fériés de l'année"""
+        with self._lock:
+            self._load(year, year, load_year)
+            return self._years[year]
+
+    def index(self, first_year: int, last_year: int, load_year: Callable[[int], Dict[date, str]]) -> HolidayIndex:
+        """Index des jours ouvrés couvrant au moins les années demandées"""
+        with self._lock:
+            index = self._index
+            if index and index.first_year <= first_year and last_year <= index.last_year:
+                return index
+            if index:
+                first_year, last_year = min(first_year, index.first_year), max(last_year, index.last_year)
+            self._load(first_year, last_year, load_year)
+            holidays = [day for year in range(first_year, last_year + 1) for day in self._years[year]]
+            self._index = HolidayIndex(first_year, last_year, holidays, self.weekend_days)
+            return self._index
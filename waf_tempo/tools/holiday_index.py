@@ -0,0 +1,114 @@
+from array import array
+from bisect import bisect_left
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est facultatif : calcul en Python pur
+    np = None
+
+
+class HolidayIndex:
+    """Index des jours ouvrés d'un calendrier sur une plage d'années
+
+    Un octet par jour (1 = jour ouvré) et les sommes cumulées des jours
+    ouvrés permettent de répondre en temps constant au comptage et en
+    O(log n) à l'ajout de jours ouvrés, sans parcourir les jours un à un.
+
+    Les conventions sont celles de workalendar :
+    ``working_days_delta(start, end)`` compte les jours ouvrés de
+    l'intervalle ``]start, end]``.
+    """
+
+    def __init__(self, first_year: int, last_year: int, holidays: Iterable[date] = (), weekend_days: Iterable[int] = (5, 6)):
+        self.first_year = first_year
+        self.last_year = last_year
+        self.origin = date(first_year, 1, 1)
+        self.end = date(last_year, 12, 31)
+        size = (self.end - self.origin).days + 1
+
+        weekend_days = set(weekend_days)
+        first_weekday = self.origin.weekday()
+        self._working = bytearray(
+            0 if (first_weekday + offset) % 7 in weekend_days else 1 for offset in range(size)
+        )
+        for holiday in holidays:
+            if self.origin <= holiday <= self.end:
+                self._working[(holiday - self.origin).days] = 0
+
+        # _prefix[i] : nombre de jours ouvrés dans [origin, origin + i[
+        self._prefix = array('l', [0]) * (size + 1)
+        self._np_prefix = self._np_working = None
+        total = 0
+        for offset, working in enumerate(self._working):
+            total += working
+            self._prefix[offset + 1] = total
+
+    def covers(self, day: date) -> bool:
+        return self.origin <= day <= self.end
+
+    def _offset(self, day: date) -> int:
+        if not self.covers(day):
+            raise ValueError(f"{day} hors de la plage indexée ({self.first_year}-{self.last_year})")
+        return (day - self.origin).days
+
+    def is_working_day(self, day: date) -> bool:
+        return bool(self._working[self._offset(day)])
+
+    def non_working_days(self, start: date, end: date):
+        """Jours non ouvrés (week-ends et fériés) de l'intervalle ``[start, end]``"""
+        first, last = self._offset(start), self._offset(end)
+        return [self.origin + timedelta(days=offset) for offset in range(first, last + 1) if not self._working[offset]]
+
+    def working_days_delta(self, start: date, end: date, include_start: bool = False) -> int:
+        """Nombre de jours ouvrés de ``]start, end]`` (``[start, end]`` avec ``include_start``)"""
+        if start > end:
+            start, end = end, start
+        first, last = self._offset(start), self._offset(end)
+        count = self._prefix[last + 1] - self._prefix[first + 1]
+        if include_start:
+            count += self._working[first]
+        return count
+
+    def working_days_delta_many(self, starts: Sequence[date], ends: Sequence[date], include_start: bool = False) -> List[int]:
+        """``working_days_delta`` appliqué à des listes de dates, en une passe vectorisée si NumPy est disponible"""
+        if np is None or not starts:
+            return [self.working_days_delta(start, end, include_start) for start, end in zip(starts, ends)]
+
+        origin = self.origin.toordinal()
+        first = np.fromiter((day.toordinal() for day in starts), dtype=np.int64, count=len(starts)) - origin
+        last = np.fromiter((day.toordinal() for day in ends), dtype=np.int64, count=len(ends)) - origin
+        first, last = np.minimum(first, last), np.maximum(first, last)
+        if first.min() < 0 or last.max() >= len(self._working):
+            raise ValueError(f"Dates hors de la plage indexée ({self.first_year}-{self.last_year})")
+
+        if self._np_prefix is None:
+            self._np_prefix = np.array(self._prefix, dtype=np.int64)
+            self._np_working = np.frombuffer(bytes(self._working), dtype=np.uint8).astype(np.int64)
+        counts = self._np_prefix[last + 1] - self._np_prefix[first + 1]
+        if include_start:
+            counts += self._np_working[first]
+        return counts.tolist()
+
+    def add_working_days(self, day: date, delta: int) -> Optional[date]:
+        """Date située ``delta`` jours ouvrés après (ou avant si négatif) ``day``
+
+        Returns:
+            date: La date trouvée, ou None si elle sort de la plage indexée
+        """
+        offset = self._offset(day)
+        if delta == 0:
+            return day
+        if delta > 0:
+            target = self._prefix[offset + 1] + delta
+            position = bisect_left(self._prefix, target)
+            if position >= len(self._prefix):
+                return None
+            return self.origin + timedelta(days=position - 1)
+
+        target = self._prefix[offset] + delta
+        if target < 0:
+            return None
+        position = bisect_left(self._prefix, target + 1) - 1
+        return self.origin + timedelta(days=position)